@@ -6,6 +6,7 @@ from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand, CommandError
 
 from apps.applications.models import JobApplication
+from apps.reports.services import mark_backup_dirty
 
 
 class Command(BaseCommand):
@@ -68,5 +69,9 @@ class Command(BaseCommand):
             self.stdout.write(self.style.SUCCESS(f"[DRY RUN] Would reassign {count} applications to user_id={user.id}."))
             return
 
+        previous_owners = set(qs.values_list("user_id", flat=True).distinct())
         updated = qs.update(user_id=user.id)
+        # queryset.update() sends no signals; both sides' backups are now stale.
+        for user_id in previous_owners | {user.id}:
+            mark_backup_dirty(user_id, full=True)
         self.stdout.write(self.style.SUCCESS(f"Reassigned {updated} applications to {email} (user_id={user.id})."))
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:34
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.contrib.postgres.search import (
+    CombinedSearchVector,
+    SearchConfig,
+    SearchVector,
+    SearchVectorField,
+)
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0004_jobapplication_jobapp_user_applied_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='search_vector',
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=CombinedSearchVector(
+                    CombinedSearchVector(
+                        CombinedSearchVector(
+                            CombinedSearchVector(
+                                SearchVector('title', config='english', weight='A'),
+                                '||',
+                                SearchVector('company', config='english', weight='A'),
+                                SearchConfig('english'),
+                            ),
+                            '||',
+                            SearchVector('location', config='english', weight='B'),
+                            SearchConfig('english'),
+                        ),
+                        '||',
+                        SearchVector('source', config='english', weight='C'),
+                        SearchConfig('english'),
+                    ),
+                    '||',
+                    SearchVector('notes', config='english', weight='D'),
+                    SearchConfig('english'),
+                ),
+                output_field=SearchVectorField(),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=['search_vector'], name='jobapp_search_gin'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=['title', 'company', 'location'],
+                name='jobapp_trgm_gin',
+                opclasses=['gin_trgm_ops', 'gin_trgm_ops', 'gin_trgm_ops'],
+            ),
+        ),
+    ]
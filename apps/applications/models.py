@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
 from django.utils import timezone
 
@@ -31,8 +33,33 @@ class JobApplication(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Maintained by Postgres on every write; see apps.applications.search.
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector("title", weight="A", config="english")
+            + SearchVector("company", weight="A", config="english")
+            + SearchVector("location", weight="B", config="english")
+            + SearchVector("source", weight="C", config="english")
+            + SearchVector("notes", weight="D", config="english")
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
     class Meta:
         ordering = ["-updated_at", "-created_at"]
+        indexes = [
+            # (user, sort key, id) serves keyset pages in both directions.
+            models.Index(fields=["user", "applied_at", "id"], name="jobapp_user_applied_idx"),
+            models.Index(fields=["user", "updated_at", "id"], name="jobapp_user_updated_idx"),
+            models.Index(fields=["user", "status"], name="jobapp_user_status_idx"),
+            GinIndex(fields=["search_vector"], name="jobapp_search_gin"),
+            GinIndex(
+                fields=["title", "company", "location"],
+                opclasses=["gin_trgm_ops", "gin_trgm_ops", "gin_trgm_ops"],
+                name="jobapp_trgm_gin",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.company} — {self.title}"
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class KeysetPage:
+    items: list
+    next_cursor: str | None
+    prev_cursor: str | None
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(sort: str, values: tuple, direction: str) -> str:
+    """
+    Opaque token: urlsafe base64 of {"s": sort, "v": [values...], "d": "next"|"prev"}.
+    """
+    payload = {"s": sort, "v": [_encode_value(v) for v in values], "d": direction}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, sort: str) -> tuple[tuple, str]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values = tuple(_decode_value(v) for v in payload["v"])
+        direction = payload["d"]
+    except (ValueError, KeyError, TypeError, binascii.Error) as e:
+        raise InvalidCursor("Malformed cursor.") from e
+
+    if payload.get("s") != sort or direction not in ("next", "prev"):
+        raise InvalidCursor("Cursor does not match the current sort.")
+    if len(values) != 2:
+        # (sort value, id), see paginate_keyset
+        raise InvalidCursor("Malformed cursor.")
+    return values, direction
+
+
+def _seek_filter(fields: list[str], values: tuple, descending: bool) -> Q:
+    """
+    Row-value comparison `(f1, f2, ...) > (v1, v2, ...)` expanded into ORs.
+
+    The OR alone gives Postgres no index bound (it filters every earlier row),
+    so it is ANDed with the redundant `f1 >= v1` range: that becomes the
+    `Index Cond` on the matching (user, f1, f2) index and the scan starts at the cursor.
+    """
+    op = "lt" if descending else "gt"
+    cond = Q()
+    for i, field in enumerate(fields):
+        step = Q(**{f"{field}__{op}": values[i]})
+        for prev_field, prev_value in zip(fields[:i], values[:i]):
+            step &= Q(**{prev_field: prev_value})
+        cond |= step
+    bound = Q(**{f"{fields[0]}__{'lte' if descending else 'gte'}": values[0]})
+    return bound & cond
+
+
+def paginate_keyset(qs, sort: str, cursor: str | None, page_size: int) -> KeysetPage:
+    """
+    Keyset (seek) pagination over `sort` with `id` as the tie-breaker.
+
+    Every page is a single indexed range scan of `page_size + 1` rows,
+    so deep pages cost the same as the first one (no OFFSET).
+    """
+    descending = sort.startswith("-")
+    field = sort.lstrip("-")
+    fields = [field, "id"]
+    prefix = "-" if descending else ""
+
+    direction = "next"
+    values = None
+    if cursor:
+        values, direction = decode_cursor(cursor, sort)
+
+    if direction == "prev":
+        # Walk backwards from the cursor, then flip the page back into display order.
+        scan_desc = not descending
+        order = [("" if descending else "-") + f for f in fields]
+    else:
+        scan_desc = descending
+        order = [prefix + f for f in fields]
+
+    if values is not None:
+        qs = qs.filter(_seek_filter(fields, values, scan_desc))
+
+    rows = list(qs.order_by(*order)[: page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    if direction == "prev":
+        rows.reverse()
+        has_next = values is not None
+        has_prev = has_more
+    else:
+        has_next = has_more
+        has_prev = values is not None
+
+    next_cursor = prev_cursor = None
+    if rows and has_next:
+        last = rows[-1]
+        next_cursor = encode_cursor(sort, (getattr(last, field), last.id), "next")
+    if rows and has_prev:
+        first = rows[0]
+        prev_cursor = encode_cursor(sort, (getattr(first, field), first.id), "prev")
+
+    return KeysetPage(items=rows, next_cursor=next_cursor, prev_cursor=prev_cursor)
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db.models import F, FloatField, Q
+from django.db.models.functions import Cast, Greatest
+
+SEARCH_CONFIG = "english"
+
+
+def search_applications(qs, q: str):
+    """
+    Full-text + typo-tolerant search over a JobApplication queryset.
+
+    - `search_vector` (generated tsvector over title/company/location/source/notes,
+      GIN-indexed) answers word and phrase matches (websearch syntax).
+    - `%>` word-similarity on title/company/location (pg_trgm GIN index) catches
+      typos and partial words the stemmer can't ("gogle", "fronten").
+
+    Rows are annotated with `rank` so callers can order by relevance.
+    """
+    query = SearchQuery(q, search_type="websearch", config=SEARCH_CONFIG)
+
+    matches = (
+        Q(search_vector=query)
+        | Q(title__trigram_word_similar=q)
+        | Q(company__trigram_word_similar=q)
+        | Q(location__trigram_word_similar=q)
+    )
+
+    rank = Cast(SearchRank(F("search_vector"), query), FloatField()) + Greatest(
+        TrigramWordSimilarity(q, "title"),
+        TrigramWordSimilarity(q, "company"),
+        TrigramWordSimilarity(q, "location"),
+    )
+    return qs.filter(matches).annotate(rank=rank)
@@ -5,7 +5,6 @@ from datetime import datetime
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
@@ -13,9 +12,13 @@ from django.views.decorators.http import require_POST
 
 from .forms import JobApplicationForm
 from .models import JobApplication
+from .pagination import InvalidCursor, paginate_keyset
+from .search import search_applications
 
 logger = logging.getLogger(__name__)
 
+PAGE_SIZE = 50
+
 
 @login_required
 def list_applications(request):
@@ -25,14 +28,11 @@ def list_applications(request):
         q = (request.GET.get("q") or "").strip()
         status = (request.GET.get("status") or "").strip()
         month = (request.GET.get("month") or "").strip()
-        sort = (request.GET.get("sort") or "-applied_at").strip()
+        sort = (request.GET.get("sort") or ("relevance" if q else "-applied_at")).strip()
+        cursor = (request.GET.get("cursor") or "").strip() or None
 
         if q:
-            qs = qs.filter(
-                Q(title__icontains=q)
-                | Q(company__icontains=q)
-                | Q(location__icontains=q)
-            )
+            qs = search_applications(qs, q)
 
         if status:
             qs = qs.filter(status=status)
@@ -50,16 +50,27 @@ def list_applications(request):
                 pass
 
         allowed_sorts = {"applied_at", "-applied_at", "updated_at", "-updated_at"}
+        if q:
+            allowed_sorts.add("relevance")
         if sort not in allowed_sorts:
             sort = "-applied_at"
 
-        qs = qs.order_by(sort)[:200]
+        # The list never renders notes or the search vector; don't ship them over the wire.
+        qs = qs.defer("notes", "search_vector")
+
+        order_key = "-rank" if sort == "relevance" else sort
+        try:
+            page = paginate_keyset(qs, order_key, cursor, PAGE_SIZE)
+        except InvalidCursor:
+            page = paginate_keyset(qs, order_key, None, PAGE_SIZE)
 
         return render(
             request,
             "applications/list.html",
             {
-                "items": qs,
+                "items": page.items,
+                "next_cursor": page.next_cursor,
+                "prev_cursor": page.prev_cursor,
                 "q": q,
                 "status": status,
                 "month": month,
@@ -155,7 +166,7 @@ def update_status(request, pk: int):
 
     try:
         app.status = status
-        app.save(update_fields=["status"])
+        app.save(update_fields=["status", "updated_at"])
         return JsonResponse({"ok": True, "status": status})
     except Exception:
         logger.exception("update_status save failed user=%s pk=%s status=%s", request.user.id, pk, status)
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0004_jobapplication_jobapp_user_applied_idx_and_more'),
+        ('interviews', '0003_interviewevent_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='interviewevent',
+            index=models.Index(fields=['user', 'starts_at'], name='interview_user_starts_idx'),
+        ),
+    ]
@@ -30,6 +30,11 @@ class InterviewEvent(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "starts_at"], name="interview_user_starts_idx"),
+        ]
+
     def clean(self):
         super().clean()
         if not self.starts_at:
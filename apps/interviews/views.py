@@ -19,7 +19,8 @@ def interview_list(request):
     try:
         items = (
             InterviewEvent.objects.filter(user=request.user)
-            .select_related("application")[:200]
+            .select_related("application")
+            .order_by("-starts_at")[:200]
         )
         return render(request, "interviews/list.html", {"items": items})
     except Exception:
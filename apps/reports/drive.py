@@ -1,16 +1,36 @@
 from __future__ import annotations
 
+import hashlib
 import io
+import json
 import logging
+import os
+import random
+import re
+import socket
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from email.utils import parsedate_to_datetime
+from typing import IO, Iterator
 
+from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
+from django.utils import timezone
 
+import httplib2
 from allauth.socialaccount.models import SocialAccount, SocialApp, SocialToken
 from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from googleapiclient.http import MediaInMemoryUpload, MediaIoBaseDownload
+from googleapiclient.http import MediaInMemoryUpload, MediaIoBaseDownload, MediaIoBaseUpload
+
+from .models import CloudBackupSettings
 
 try:
     from google.auth.exceptions import RefreshError
@@ -22,6 +42,23 @@ logger = logging.getLogger(__name__)
 TOKEN_URI = "https://oauth2.googleapis.com/token"
 SCOPE = "https://www.googleapis.com/auth/drive.file"
 
+ROOT_FOLDER_NAME = "JobApply"
+BACKUPS_FOLDER_NAME = "backups"
+
+UPLOAD_CHUNK_ALIGN = 256 * 1024  # resumable chunks must be multiples of 256 KiB
+UPLOAD_CHUNK_SIZE = 8 * UPLOAD_CHUNK_ALIGN  # default, see DRIVE_UPLOAD_CHUNK_SIZE
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+SERVICE_CACHE_TTL = 15 * 60  # seconds
+SERVICE_CACHE_MAX_SIZE = 256
+
+BACKUP_LIST_CACHE_TTL = 60  # seconds
+
+RETRY_MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY = 1.0  # seconds, doubled per attempt
+RETRY_MAX_DELAY = 60.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
 
 class DriveError(RuntimeError):
     def __init__(self, message: str, *, code: str = "drive_error"):
@@ -29,9 +66,26 @@ class DriveError(RuntimeError):
         self.code = code
 
 
+def _http_status(err: HttpError) -> int | None:
+    return getattr(getattr(err, "resp", None), "status", None)
+
+
+def _is_rate_limited(err: HttpError) -> bool:
+    status = _http_status(err)
+    if status == 429:
+        return True
+    # Drive reports per-user/project quota as 403 rateLimitExceeded / userRateLimitExceeded.
+    content = getattr(err, "content", b"") or b""
+    return status == 403 and b"ratelimitexceeded" in content.lower()
+
+
 def _friendly_http_error(err: HttpError) -> DriveError:
-    status = getattr(getattr(err, "resp", None), "status", None)
+    status = _http_status(err)
 
+    if _is_rate_limited(err):
+        return DriveError(
+            "Google Drive quota/rate limit hit. Try again later.", code="rate_limited"
+        )
     if status in (401, 403):
         return DriveError(
             "Google Drive access was denied or expired. Please reconnect Google Drive.",
@@ -39,8 +93,6 @@ def _friendly_http_error(err: HttpError) -> DriveError:
         )
     if status == 404:
         return DriveError("Drive folder/file was not found. Try reconnecting.", code="not_found")
-    if status == 429:
-        return DriveError("Google Drive quota/rate limit hit. Try again later.", code="rate_limited")
     if status and 500 <= status <= 599:
         return DriveError("Google Drive is temporarily unavailable. Try again later.", code="upstream")
 
@@ -50,7 +102,7 @@ def _friendly_http_error(err: HttpError) -> DriveError:
 def _wrap_drive_call(action: str, fn):
     try:
         return fn()
-    except PermissionDenied:
+    except (PermissionDenied, DriveError):
         raise
     except RefreshError as e:
         logger.exception("Drive refresh error during %s", action)
@@ -63,11 +115,162 @@ def _wrap_drive_call(action: str, fn):
         raise DriveError("Unexpected Google Drive error. Try again later.", code="unexpected") from e
 
 
+class _TokenBucket:
+    """
+    Process-wide request throttle: `rate` requests per second on average, bursts
+    of up to `capacity`. A rate of 0 disables it.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Takes one token, sleeping until one is available. Returns the time slept.
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            # A negative balance is this caller's place in the queue.
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            _sleep(wait)
+        return wait
+
+
+class _CallStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.calls = 0
+        self.retries = 0
+        self.retry_sleep = 0.0
+        self.throttle_sleep = 0.0
+        self.gave_up = 0
+
+    def add(self, **deltas) -> None:
+        with self._lock:
+            for name, value in deltas.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "retries": self.retries,
+                "retry_sleep": round(self.retry_sleep, 3),
+                "throttle_sleep": round(self.throttle_sleep, 3),
+                "gave_up": self.gave_up,
+            }
+
+
+_sleep = time.sleep
+_throttle = _TokenBucket(rate=float(getattr(settings, "DRIVE_MAX_QPS", 10)))
+_stats = _CallStats()
+
+
+def drive_call_stats(reset: bool = False) -> dict:
+    """
+    Counters since process start (or the last reset): HTTP calls, retries, seconds
+    slept in backoff and in the throttle, and calls that failed after all retries.
+    """
+    snap = _stats.snapshot()
+    if reset:
+        _stats.reset()
+    return snap
+
+
+def _retry_after(err: HttpError) -> float | None:
+    resp = getattr(err, "resp", None)
+    value = resp.get("retry-after") if hasattr(resp, "get") else None
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max((parsedate_to_datetime(value) - timezone.now()).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff_delay(attempt: int, err: Exception) -> float:
+    # "Full jitter" exponential backoff; Retry-After, when sent, is a lower bound.
+    delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**attempt))
+    if isinstance(err, HttpError):
+        delay = max(delay, _retry_after(err) or 0.0)
+    return min(delay, RETRY_MAX_DELAY)
+
+
+def _is_retryable(err: Exception) -> bool:
+    if isinstance(err, HttpError):
+        return _http_status(err) in RETRY_STATUSES or _is_rate_limited(err)
+    return isinstance(err, (ConnectionError, socket.timeout))
+
+
+def _execute(fn, *, idempotent: bool = True):
+    """
+    Runs one Drive HTTP call (`request.execute`, `next_chunk`, ...) through the
+    throttle. Idempotent calls are retried on 429/5xx/rate-limit 403 and
+    connection errors with backoff; creates are not, a retry could duplicate
+    the file.
+    """
+    attempt = 0
+    while True:
+        waited = _throttle.acquire()
+        _stats.add(calls=1, throttle_sleep=waited)
+        try:
+            return fn()
+        except Exception as e:
+            if not (idempotent and _is_retryable(e)):
+                raise
+            if attempt >= RETRY_MAX_ATTEMPTS:
+                _stats.add(gave_up=1)
+                raise
+            delay = _backoff_delay(attempt, e)
+            logger.warning("Drive call failed (%r), retry %s in %.1fs", e, attempt + 1, delay)
+            _stats.add(retries=1, retry_sleep=delay)
+            _sleep(delay)
+            attempt += 1
+
+
 @dataclass(frozen=True)
 class DriveFile:
     file_id: str
     name: str
     mime_type: str
+    size: int | None = None
+    created_time: datetime | None = None
+
+    @classmethod
+    def from_api(cls, f: dict) -> DriveFile:
+        created = f.get("createdTime")
+        return cls(
+            file_id=f["id"],
+            name=f["name"],
+            mime_type=f.get("mimeType", ""),
+            size=int(f["size"]) if f.get("size") is not None else None,
+            created_time=(
+                datetime.fromisoformat(created.replace("Z", "+00:00")) if created else None
+            ),
+        )
+
+
+@dataclass(frozen=True)
+class BackupPage:
+    files: list[DriveFile]
+    next_page_token: str | None = None
 
 
 def get_drive_status(user) -> dict:
@@ -76,12 +279,13 @@ def get_drive_status(user) -> dict:
         if not acc:
             return {"connected": False, "has_refresh_token": False}
 
+        email = (acc.extra_data or {}).get("email")
         tok = SocialToken.objects.filter(account=acc).first()
         if not tok:
-            return {"connected": True, "has_refresh_token": False}
+            return {"connected": True, "has_refresh_token": False, "email": email}
 
         refresh = (tok.token_secret or "").strip()
-        return {"connected": True, "has_refresh_token": bool(refresh)}
+        return {"connected": True, "has_refresh_token": bool(refresh), "email": email}
 
     try:
         return _do()
@@ -90,6 +294,49 @@ def get_drive_status(user) -> dict:
         return {"connected": False, "has_refresh_token": False, "error": "Drive status check failed"}
 
 
+def _to_google_expiry(expires_at):
+    # google-auth compares expiry against naive UTC.
+    if expires_at is None:
+        return None
+    return timezone.make_naive(expires_at, dt_timezone.utc)
+
+
+class _SocialTokenCredentials(Credentials):
+    """
+    Credentials that write every refreshed access token (and its expiry) back to
+    the SocialToken row they were built from.
+
+    With `expiry` known, google-auth refreshes proactively shortly before the
+    token runs out instead of sending a request that comes back 401, and the
+    next process that builds credentials starts from the fresh token.
+    """
+
+    def __init__(self, *args, social_token_pk: int | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._social_token_pk = social_token_pk
+
+    def _make_copy(self):
+        cred = super()._make_copy()
+        cred._social_token_pk = self._social_token_pk
+        return cred
+
+    def refresh(self, request):
+        super().refresh(request)
+        if self._social_token_pk is None:
+            return
+
+        fields = {
+            "token": self.token,
+            "expires_at": (
+                timezone.make_aware(self.expiry, dt_timezone.utc) if self.expiry else None
+            ),
+        }
+        if self.refresh_token:
+            fields["token_secret"] = self.refresh_token
+        # Single UPDATE: concurrent refreshes race harmlessly, each token is valid.
+        SocialToken.objects.filter(pk=self._social_token_pk).update(**fields)
+
+
 def _credentials_from_allauth(user) -> Credentials:
     acc = SocialAccount.objects.filter(user=user, provider="google").first()
     if not acc:
@@ -110,20 +357,108 @@ def _credentials_from_allauth(user) -> Credentials:
     if not refresh_token:
         raise PermissionDenied("Google refresh token is missing. Reconnect Google Drive.")
 
-    return Credentials(
+    return _SocialTokenCredentials(
         token=access_token,
         refresh_token=refresh_token,
         token_uri=TOKEN_URI,
         client_id=app.client_id,
         client_secret=app.secret,
         scopes=[SCOPE],
+        expiry=_to_google_expiry(tok.expires_at),
+        social_token_pk=tok.pk,
+    )
+
+
+class _ServiceCache:
+    """
+    Process-local LRU of built Drive services, one entry per user and thread.
+
+    A service owns its httplib2.Http, which is not thread-safe, so threads never
+    share one (backup pool threads, a threaded web server serving two requests
+    of the same user). An entry is only reused while the user's token
+    fingerprint matches, so a reconnect (new token row / refresh token) or a
+    disconnect rebuilds it. The TTL bounds how long a service outlives changes
+    made by another process.
+    """
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[tuple[int, int], tuple[tuple, float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _slot(user_id: int) -> tuple[int, int]:
+        # A reused ident belongs to a thread that has exited, so sharing is safe.
+        return (user_id, threading.get_ident())
+
+    def get(self, user_id: int, key: tuple):
+        slot = self._slot(user_id)
+        with self._lock:
+            entry = self._entries.get(slot)
+            if not entry:
+                return None
+            entry_key, expires_at, service = entry
+            if entry_key != key or expires_at <= time.monotonic():
+                del self._entries[slot]
+                return None
+            self._entries.move_to_end(slot)
+            return service
+
+    def put(self, user_id: int, key: tuple, service) -> None:
+        slot = self._slot(user_id)
+        with self._lock:
+            self._entries[slot] = (key, time.monotonic() + self.ttl, service)
+            self._entries.move_to_end(slot)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        """
+        Drops the user's services in every thread.
+        """
+        with self._lock:
+            for slot in [slot for slot in self._entries if slot[0] == user_id]:
+                del self._entries[slot]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_service_cache = _ServiceCache(ttl=SERVICE_CACHE_TTL, max_size=SERVICE_CACHE_MAX_SIZE)
+
+
+def _token_key(user) -> tuple | None:
+    """
+    One query instead of account + token + app lookups on every cache hit.
+    """
+    return (
+        SocialToken.objects.filter(account__user=user, account__provider="google")
+        .order_by("pk")
+        .values_list("pk", "token_secret", "app_id")
+        .first()
     )
 
 
 def _service(user):
     def _do():
+        key = _token_key(user)
+        if key is None:
+            _service_cache.invalidate(user.pk)
+        else:
+            service = _service_cache.get(user.pk, key)
+            if service is not None:
+                return service
+
         creds = _credentials_from_allauth(user)
-        return build("drive", "v3", credentials=creds)
+        # Socket timeout so a hung connection can't pin a backup worker thread forever.
+        http = AuthorizedHttp(creds, http=httplib2.Http(timeout=settings.DRIVE_HTTP_TIMEOUT))
+        # The discovery document bundled with google-api-python-client, no HTTP fetch.
+        service = build("drive", "v3", http=http, static_discovery=True, cache_discovery=False)
+        if key is not None:
+            _service_cache.put(user.pk, key, service)
+        return service
 
     return _wrap_drive_call("_service", _do)
 
@@ -133,7 +468,7 @@ def _find_folder(service, name: str, parent_id: str | None) -> str | None:
     if parent_id:
         q += f" and '{parent_id}' in parents"
 
-    res = service.files().list(q=q, fields="files(id,name)", pageSize=1).execute()
+    res = _execute(service.files().list(q=q, fields="files(id,name)", pageSize=1).execute)
     files = res.get("files", [])
     return files[0]["id"] if files else None
 
@@ -142,7 +477,7 @@ def _create_folder(service, name: str, parent_id: str | None) -> str:
     meta = {"name": name, "mimeType": "application/vnd.google-apps.folder"}
     if parent_id:
         meta["parents"] = [parent_id]
-    created = service.files().create(body=meta, fields="id").execute()
+    created = _execute(service.files().create(body=meta, fields="id").execute, idempotent=False)
     return created["id"]
 
 
@@ -153,68 +488,409 @@ def get_or_create_folder(service, name: str, parent_id: str | None = None) -> st
     return _create_folder(service, name=name, parent_id=parent_id)
 
 
-def ensure_jobapply_folder(user, root_name: str = "JobApply", subfolder: str | None = "backups") -> str:
+def _backup_settings(
+    user, backup_settings: CloudBackupSettings | None = None
+) -> CloudBackupSettings | None:
+    # A row the caller already loaded wins. Otherwise reverse one-to-one access is
+    # cached on the user instance (and pre-filled by select_related("user") in the
+    # backup worker), so repeat calls are free.
+    if backup_settings is not None:
+        return backup_settings
+    try:
+        return user.cloud_backup
+    except CloudBackupSettings.DoesNotExist:
+        return None
+
+
+def _save_backup_settings(
+    user, backup_settings: CloudBackupSettings | None = None, **fields
+) -> CloudBackupSettings:
+    s = _backup_settings(user, backup_settings)
+    if s is None or s.pk is None:
+        s, _ = CloudBackupSettings.objects.get_or_create(user=user)
+        user.cloud_backup = s
+    for name, value in fields.items():
+        setattr(s, name, value)
+    s.save(update_fields=[*fields, "updated_at"])
+    return s
+
+
+def _remember_folder_ids(
+    user, root_id: str, folder_id: str, backup_settings: CloudBackupSettings | None = None
+) -> None:
+    _save_backup_settings(
+        user, backup_settings, drive_root_folder_id=root_id, drive_backups_folder_id=folder_id
+    )
+
+
+def _forget_folder_ids(user, backup_settings: CloudBackupSettings | None = None) -> None:
+    # Backups in the lost folder are gone too, so the next auto backup must not be skipped.
+    CloudBackupSettings.objects.filter(user=user).update(
+        drive_root_folder_id="", drive_backups_folder_id="", backup_fingerprint=""
+    )
+    s = _backup_settings(user, backup_settings)
+    if s is not None:
+        s.drive_root_folder_id = s.drive_backups_folder_id = s.backup_fingerprint = ""
+
+
+def _resolve_folder(
+    service,
+    user,
+    root_name: str,
+    subfolder: str | None,
+    backup_settings: CloudBackupSettings | None = None,
+) -> tuple[str, bool]:
+    """
+    Returns (folder_id, from_cache). Only the default JobApply/backups path is
+    persisted on CloudBackupSettings; other paths are looked up every time.
+    """
+    cacheable = (root_name, subfolder) == (ROOT_FOLDER_NAME, BACKUPS_FOLDER_NAME)
+    if cacheable:
+        s = _backup_settings(user, backup_settings)
+        if s is not None and s.drive_backups_folder_id:
+            return s.drive_backups_folder_id, True
+
+    root_id = get_or_create_folder(service, root_name, parent_id=None)
+    folder_id = root_id
+    if subfolder:
+        folder_id = get_or_create_folder(service, subfolder, parent_id=root_id)
+    if cacheable:
+        _remember_folder_ids(user, root_id, folder_id, backup_settings)
+    return folder_id, False
+
+
+def _in_folder(
+    service,
+    user,
+    root_name: str,
+    subfolder: str | None,
+    fn,
+    *,
+    retry_lost: bool = True,
+    backup_settings: CloudBackupSettings | None = None,
+):
+    """
+    Calls fn(folder_id). If a persisted folder id is gone on Drive (404), the ids
+    are dropped, the folder is resolved again and fn is retried once. With
+    retry_lost=False it raises DriveError(code="folder_lost") instead.
+    """
+    folder_id, from_cache = _resolve_folder(service, user, root_name, subfolder, backup_settings)
+    try:
+        return fn(folder_id)
+    except HttpError as e:
+        if not from_cache or getattr(getattr(e, "resp", None), "status", None) != 404:
+            raise
+        _forget_folder_ids(user, backup_settings)
+        if not retry_lost:
+            logger.warning("Drive folder %s not found for user=%s", folder_id, user.pk)
+            raise DriveError("Drive backups folder was not found.", code="folder_lost") from e
+        logger.warning("Drive folder %s not found for user=%s, resolving again", folder_id, user.pk)
+        folder_id, _ = _resolve_folder(service, user, root_name, subfolder, backup_settings)
+        return fn(folder_id)
+
+
+def ensure_jobapply_folder(
+    user,
+    root_name: str = ROOT_FOLDER_NAME,
+    subfolder: str | None = BACKUPS_FOLDER_NAME,
+    *,
+    backup_settings: CloudBackupSettings | None = None,
+) -> str:
+    """
+    `backup_settings` is the user's row when the caller already has it, so the
+    stored folder ids are read and updated there.
+    """
     def _do():
         service = _service(user)
-        root_id = get_or_create_folder(service, root_name, parent_id=None)
-        if subfolder:
-            return get_or_create_folder(service, subfolder, parent_id=root_id)
-        return root_id
+        folder_id, _ = _resolve_folder(service, user, root_name, subfolder, backup_settings)
+        return folder_id
 
     return _wrap_drive_call("ensure_jobapply_folder", _do)
 
 
+def _upload_chunk_size() -> int:
+    size = int(getattr(settings, "DRIVE_UPLOAD_CHUNK_SIZE", UPLOAD_CHUNK_SIZE))
+    return max(size // UPLOAD_CHUNK_ALIGN, 1) * UPLOAD_CHUNK_ALIGN
+
+
+def _media_body(content: bytes | IO[bytes], mime_type: str):
+    """
+    Bytes go up in a single request. Seekable file objects (e.g. a spooled export)
+    are read chunk by chunk through a resumable session, unless they fit in one chunk.
+    """
+    if isinstance(content, (bytes, bytearray)):
+        return MediaInMemoryUpload(bytes(content), mimetype=mime_type, resumable=False)
+
+    chunk_size = _upload_chunk_size()
+    content.seek(0, os.SEEK_END)
+    size = content.tell()
+    content.seek(0)
+    return MediaIoBaseUpload(
+        content,
+        mimetype=mime_type,
+        chunksize=chunk_size,
+        resumable=size > chunk_size,
+    )
+
+
+def _upload_session_key(folder_id: str, filename: str, content: IO[bytes]) -> str:
+    """
+    Identifies "the same upload": a saved session is only resumed for identical
+    bytes going to the same name and folder.
+    """
+    h = hashlib.sha256(f"{folder_id}/{filename}\n".encode("utf-8"))
+    content.seek(0)
+    for block in iter(lambda: content.read(1024 * 1024), b""):
+        h.update(block)
+    content.seek(0)
+    return h.hexdigest()
+
+
+def _upload_resumable(request, user, key: str) -> dict:
+    """
+    Drives a resumable upload chunk by chunk.
+
+    The session URI is saved on CloudBackupSettings as soon as Drive hands it
+    out. If this call dies half-way (retries exhausted, worker restarted), the
+    next upload of the same content asks Drive for the last confirmed byte and
+    continues from there instead of starting over (see `_resume_upload`).
+    """
+    s = _backup_settings(user)
+    if s is not None and s.upload_session_uri and s.upload_session_key == key:
+        try:
+            response = _resume_upload(request, s.upload_session_uri)
+        except HttpError as e:
+            if _http_status(e) not in (404, 410):
+                raise
+            # The saved session expired on Drive's side: start a fresh one.
+            logger.warning("Drive upload session expired for user=%s, restarting upload", user.pk)
+        else:
+            _forget_upload_session(user)
+            return response
+
+    saved_uri = None
+    response = None
+    while response is None:
+        # A failed chunk leaves the request in its error state, so a retry
+        # re-syncs the offset with Drive before sending more bytes.
+        _, response = _execute(request.next_chunk)
+        if response is None and request.resumable_uri != saved_uri:
+            saved_uri = request.resumable_uri
+            _save_backup_settings(user, upload_session_uri=saved_uri, upload_session_key=key)
+
+    _forget_upload_session(user)
+    return response
+
+
+def _resume_upload(request, session_uri: str) -> dict:
+    """
+    Finishes the upload in a session opened by an earlier attempt, following
+    Drive's documented resume protocol over the request's own authorized http:
+    an empty PUT with `Content-Range: bytes */*` reports the confirmed bytes,
+    then the rest goes up chunk by chunk. A failed step asks again before
+    sending more, so a retry never repeats or skips bytes.
+    """
+    media = request.resumable
+    size = media.size()
+    offset = None  # unknown until Drive has told us
+
+    def _put(body: bytes, content_range: str) -> dict | None:
+        nonlocal offset
+        resp, content = request.http.request(
+            session_uri,
+            method="PUT",
+            body=body,
+            headers={"Content-Range": content_range, "Content-Length": str(len(body))},
+        )
+        if resp.status in (200, 201):
+            return json.loads(content)
+        if resp.status != 308:
+            raise HttpError(resp, content, uri=session_uri)
+        # "Range: bytes=0-N" holds the confirmed bytes; no header means none yet.
+        confirmed = resp.get("range")
+        offset = int(confirmed.rsplit("-", 1)[1]) + 1 if confirmed else 0
+        return None
+
+    def _step() -> dict | None:
+        nonlocal offset
+        if offset is None:
+            done = _put(b"", "bytes */*")
+            if done is not None:
+                return done
+        start, offset = offset, None
+        data = media.getbytes(start, media.chunksize())
+        return _put(data, f"bytes {start}-{start + len(data) - 1}/{size}")
+
+    response = None
+    while response is None:
+        response = _execute(_step)
+    return response
+
+
+def _forget_upload_session(user) -> None:
+    s = _backup_settings(user)
+    if s is not None and s.pk is not None and (s.upload_session_uri or s.upload_session_key):
+        _save_backup_settings(user, upload_session_uri="", upload_session_key="")
+
+
+def _create_file(
+    service, user, folder_id: str, filename: str, content: bytes | IO[bytes], mime_type: str
+) -> dict:
+    media = _media_body(content, mime_type)
+    meta = {"name": filename, "parents": [folder_id]}
+    request = service.files().create(
+        body=meta, media_body=media, fields="id,name,mimeType,size,createdTime"
+    )
+    if not media.resumable():
+        return _execute(request.execute, idempotent=False)
+    return _upload_resumable(request, user, _upload_session_key(folder_id, filename, content))
+
+
 def upload_backup(
     user,
     filename: str,
-    content_bytes: bytes,
+    content_bytes: bytes | IO[bytes],
     mime_type: str,
-    root_name: str = "JobApply",
-    subfolder: str | None = "backups",
+    root_name: str = ROOT_FOLDER_NAME,
+    subfolder: str | None = BACKUPS_FOLDER_NAME,
 ) -> DriveFile:
+    """
+    `content_bytes` may be raw bytes or a seekable binary file object. Files larger
+    than one upload chunk go through a resumable session (see `_upload_resumable`).
+    """
     def _do():
         service = _service(user)
-        folder_id = ensure_jobapply_folder(user, root_name=root_name, subfolder=subfolder)
-        media = MediaInMemoryUpload(content_bytes, mimetype=mime_type, resumable=False)
-        meta = {"name": filename, "parents": [folder_id]}
-        created = service.files().create(body=meta, media_body=media, fields="id,name,mimeType").execute()
-        return DriveFile(file_id=created["id"], name=created["name"], mime_type=created["mimeType"])
+
+        try:
+            created = _in_folder(
+                service,
+                user,
+                root_name,
+                subfolder,
+                lambda folder_id: _create_file(
+                    service, user, folder_id, filename, content_bytes, mime_type
+                ),
+            )
+        finally:
+            invalidate_backup_listing(user)
+        return DriveFile.from_api(created)
 
     return _wrap_drive_call("upload_backup", _do)
 
 
-def list_backups(
+def _backup_listing_generation_key(user) -> str:
+    return f"drive:backups:gen:{user.pk}"
+
+
+def invalidate_backup_listing(user) -> None:
+    """
+    Called after our own uploads/rotations/deletes. Backups made by the worker in
+    another process change `last_run_at`, which is part of the cache key too.
+    """
+    cache.set(_backup_listing_generation_key(user), time.time_ns(), None)
+
+
+def _backup_listing_cache_key(
+    user, root_name, subfolder, page_size, page_token, backup_settings=None
+) -> str:
+    s = _backup_settings(user, backup_settings)
+    last_run = s.last_run_at.timestamp() if s is not None and s.last_run_at else 0
+    generation = cache.get(_backup_listing_generation_key(user), 0)
+    raw = (
+        f"{user.pk}:{generation}:{last_run}:{root_name}/{subfolder}"
+        f":{page_size}:{page_token or ''}"
+    )
+    # Page tokens are long and opaque: hash to keep keys backend-safe.
+    return "drive:backups:" + hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def list_backups_page(
     user,
-    limit: int = 30,
-    root_name: str = "JobApply",
-    subfolder: str | None = "backups",
-) -> list[DriveFile]:
+    page_size: int = 30,
+    page_token: str | None = None,
+    root_name: str = ROOT_FOLDER_NAME,
+    subfolder: str | None = BACKUPS_FOLDER_NAME,
+    *,
+    backup_settings: CloudBackupSettings | None = None,
+) -> BackupPage:
+    """
+    One page of the backups folder, newest first. Pages are cached per user for
+    BACKUP_LIST_CACHE_TTL seconds, so re-rendering the backups page makes no
+    Drive calls.
+
+    `backup_settings` is the user's row when the caller already has it (stored
+    folder ids, last_run_at); otherwise it is loaded through the user.
+    """
+    key = _backup_listing_cache_key(
+        user, root_name, subfolder, page_size, page_token, backup_settings
+    )
+    page = cache.get(key)
+    if page is not None:
+        return page
+
     def _do():
         service = _service(user)
-        folder_id = ensure_jobapply_folder(user, root_name=root_name, subfolder=subfolder)
-        res = service.files().list(
-            q=f"'{folder_id}' in parents and trashed=false",
-            orderBy="createdTime desc",
-            pageSize=limit,
-            fields="files(id,name,mimeType)",
-        ).execute()
-        return [DriveFile(file_id=f["id"], name=f["name"], mime_type=f["mimeType"]) for f in res.get("files", [])]
+        res = _in_folder(
+            service,
+            user,
+            root_name,
+            subfolder,
+            lambda folder_id: _execute(
+                service.files()
+                .list(
+                    q=f"'{folder_id}' in parents and trashed=false",
+                    orderBy="createdTime desc",
+                    pageSize=page_size,
+                    pageToken=page_token,
+                    fields="nextPageToken,files(id,name,mimeType,size,createdTime)",
+                )
+                .execute
+            ),
+            backup_settings=backup_settings,
+        )
+        return BackupPage(
+            files=[DriveFile.from_api(f) for f in res.get("files", [])],
+            next_page_token=res.get("nextPageToken"),
+        )
 
-    return _wrap_drive_call("list_backups", _do)
+    page = _wrap_drive_call("list_backups", _do)
+    cache.set(key, page, BACKUP_LIST_CACHE_TTL)
+    return page
 
 
-def download_file(user, file_id: str) -> bytes:
-    def _do():
-        service = _service(user)
-        req = service.files().get_media(fileId=file_id)
-        buf = io.BytesIO()
-        downloader = MediaIoBaseDownload(buf, req)
-        done = False
-        while not done:
-            _, done = downloader.next_chunk()
-        return buf.getvalue()
+def list_backups(
+    user,
+    limit: int = 30,
+    root_name: str = ROOT_FOLDER_NAME,
+    subfolder: str | None = BACKUPS_FOLDER_NAME,
+) -> list[DriveFile]:
+    return list_backups_page(user, page_size=limit, root_name=root_name, subfolder=subfolder).files
+
+
+def iter_download(user, file_id: str, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Yields the file in pieces of up to `chunk_size` bytes as they arrive.
+
+    The download buffer is emptied after every chunk, so memory stays bounded by
+    the chunk size and the consumer (e.g. import_csv) can work on the first rows
+    while the rest is still in flight.
+    """
+    service = _wrap_drive_call("iter_download", lambda: _service(user))
+    req = service.files().get_media(fileId=file_id)
+    buf = io.BytesIO()
+    downloader = MediaIoBaseDownload(buf, req, chunksize=chunk_size)
+    done = False
+    while not done:
+        _, done = _wrap_drive_call("iter_download", lambda: _execute(downloader.next_chunk))
+        chunk = buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+        if chunk:
+            yield chunk
+
 
-    return _wrap_drive_call("download_file", _do)
+def download_file(user, file_id: str) -> bytes:
+    return b"".join(iter_download(user, file_id))
 
 
 def disconnect_drive(user) -> None:
@@ -222,63 +898,266 @@ def disconnect_drive(user) -> None:
     if not acc:
         return
     SocialToken.objects.filter(account=acc).delete()
+    _service_cache.invalidate(user.pk)
+    invalidate_backup_listing(user)
+    # A reconnect may use a different Google account with its own folders.
+    _forget_folder_ids(user)
 
 
-def _find_file_in_folder_by_name(service, folder_id: str, name: str) -> str | None:
-    q = f"'{folder_id}' in parents and trashed=false and name='{name}'"
-    res = service.files().list(q=q, fields="files(id,name)", pageSize=1).execute()
-    files = res.get("files", [])
-    return files[0]["id"] if files else None
+ROTATION_PREFIX = "autobackup"
+BATCH_MAX_CALLS = 100  # Drive's per-batch limit
 
 
-def _rename_file(service, file_id: str, new_name: str) -> None:
-    service.files().update(fileId=file_id, body={"name": new_name}).execute()
+DELTA_PREFIX = f"{ROTATION_PREFIX}_delta_"
+_FULL_BACKUP_RE = re.compile(rf"^{ROTATION_PREFIX}(?:_latest|-\d+)\.")
 
 
-def _delete_file(service, file_id: str) -> None:
-    service.files().delete(fileId=file_id).execute()
+def _delta_name(ext: str, now: datetime | None = None) -> str:
+    # Sortable UTC timestamp; restore orders by createdTime and uses the name as tie-breaker.
+    ts = (now or timezone.now()).astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    return f"{DELTA_PREFIX}{ts}.{ext}"
 
 
-def upload_backup_rotate_3(
+def _rotation_name(slot: int, ext: str) -> str:
+    if slot == 0:
+        return f"{ROTATION_PREFIX}_latest.{ext}"
+    return f"{ROTATION_PREFIX}-{slot}.{ext}"
+
+
+def _list_folder(service, folder_id: str, name_contains: str) -> list[dict]:
+    q = f"'{folder_id}' in parents and trashed=false and name contains '{name_contains}'"
+    files: list[dict] = []
+    page_token = None
+    while True:
+        res = _execute(
+            service.files()
+            .list(
+                q=q,
+                orderBy="createdTime desc",
+                pageSize=1000,
+                pageToken=page_token,
+                fields="nextPageToken,files(id,name,mimeType,size,createdTime)",
+            )
+            .execute
+        )
+        files.extend(res.get("files", []))
+        page_token = res.get("nextPageToken")
+        if not page_token:
+            return files
+
+
+def _rotation_plan(
+    files: list[dict], keep: int, ext: str
+) -> tuple[list[str], list[tuple[str, str]]]:
+    """
+    Works out the rotation from one folder listing (newest first).
+
+    Slot 0 is autobackup_latest, slot n is autobackup-n. Every file moves down one
+    slot; whatever would land at `keep` or beyond is deleted, as are duplicate
+    names and slots left over from a larger retention.
+    Returns (ids to delete, [(id, new name)]).
+    """
+    pattern = re.compile(rf"^{ROTATION_PREFIX}(?:_latest|-(\d+))\.{re.escape(ext)}$")
+    deletes: list[str] = []
+    renames: list[tuple[str, str]] = []
+    seen: set[int] = set()
+
+    for f in files:
+        m = pattern.match(f["name"])
+        if not m:
+            continue
+        slot = int(m.group(1) or 0)
+        if slot in seen or slot + 1 >= keep:
+            deletes.append(f["id"])
+        else:
+            renames.append((f["id"], _rotation_name(slot + 1, ext)))
+        seen.add(slot)
+
+    return deletes, renames
+
+
+def _execute_batch(service, requests: list[tuple[str, object]]) -> None:
+    """
+    Sends the requests as Drive batches. Failures of single steps are logged,
+    not raised: a failed rename must not block the new backup.
+    """
+
+    def _callback(request_id, response, exception):
+        if exception is not None:
+            logger.warning("Drive rotate step failed: %s: %r", request_id, exception)
+
+    for i in range(0, len(requests), BATCH_MAX_CALLS):
+        batch = service.new_batch_http_request(callback=_callback)
+        for request_id, req in requests[i : i + BATCH_MAX_CALLS]:
+            batch.add(req, request_id=request_id)
+        _execute(batch.execute)
+
+
+def upload_backup_rotate(
     user,
-    content_bytes: bytes,
-    mime_type: str = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    content_bytes: bytes | IO[bytes],
+    *,
+    keep: int = 3,
+    mime_type: str = "text/csv",
     ext: str = "csv",
-    root_name: str = "JobApply",
-    subfolder: str | None = "backups",
-) -> None:
+    root_name: str = ROOT_FOLDER_NAME,
+    subfolder: str | None = BACKUPS_FOLDER_NAME,
+) -> DriveFile:
+    """
+    Uploads `autobackup_latest.<ext>` and keeps `keep` rotated files in total
+    (latest, -1 .. -(keep-1)).
+
+    One listing, one batch with the deletes/renames, one upload, instead of a
+    lookup and a request per file.
+    """
+    if keep < 1:
+        raise ValueError("keep must be at least 1")
+
     def _do():
-        def safe(action, fn):
-            try:
-                fn()
-            except (HttpError, RefreshError, DriveError):
-                logger.exception("Drive rotate step failed: %s", action)
+        service = _service(user)
+
+        def _rotate(folder_id: str):
+            files = _list_folder(service, folder_id, ROTATION_PREFIX)
+            deletes, renames = _rotation_plan(files, keep, ext)
+
+            files_api = service.files()
+            requests = [(f"delete {fid}", files_api.delete(fileId=fid)) for fid in deletes]
+            requests += [
+                (f"rename {fid} -> {name}", files_api.update(fileId=fid, body={"name": name}))
+                for fid, name in renames
+            ]
+            if requests:
+                _execute_batch(service, requests)
+
+            created = _create_file(
+                service, user, folder_id, _rotation_name(0, ext), content_bytes, mime_type
+            )
+
+            # Deltas belong to the previous snapshot. Dropped only once the new one
+            # is in place, so a failed upload leaves a restorable chain behind.
+            stale_deltas = [f["id"] for f in files if f["name"].startswith(DELTA_PREFIX)]
+            if stale_deltas:
+                deletes = [(f"delete {fid}", files_api.delete(fileId=fid)) for fid in stale_deltas]
+                _execute_batch(service, deletes)
+            return created
+
+        try:
+            created = _in_folder(service, user, root_name, subfolder, _rotate)
+        finally:
+            invalidate_backup_listing(user)
+        return DriveFile.from_api(created)
+
+    return _wrap_drive_call("upload_backup_rotate", _do)
+
+
+def upload_backup_delta(
+    user,
+    content_bytes: bytes | IO[bytes],
+    *,
+    mime_type: str = "text/csv",
+    ext: str = "csv",
+    root_name: str = ROOT_FOLDER_NAME,
+    subfolder: str | None = BACKUPS_FOLDER_NAME,
+) -> DriveFile:
+    """
+    Uploads a delta backup (`autobackup_delta_<utc timestamp>.<ext>`) next to the
+    rotated full snapshots. The next upload_backup_rotate() removes it again.
 
+    A delta is useless without the snapshot it builds on: if the stored folder
+    is gone, DriveError(code="folder_lost") is raised instead of uploading into
+    a new, empty folder. The caller should make a full backup.
+    """
+
+    def _do():
         service = _service(user)
-        folder_id = ensure_jobapply_folder(user, root_name=root_name, subfolder=subfolder)
-
-        latest_name = f"autobackup_latest.{ext}"
-        b1_name = f"autobackup-1.{ext}"
-        b2_name = f"autobackup-2.{ext}"
-
-        latest_id = _find_file_in_folder_by_name(service, folder_id, latest_name)
-        b1_id = _find_file_in_folder_by_name(service, folder_id, b1_name)
-        b2_id = _find_file_in_folder_by_name(service, folder_id, b2_name)
-
-        if b2_id:
-            safe("delete backup-2", lambda: _delete_file(service, b2_id))
-        if b1_id:
-            safe("rename backup-1 -> backup-2", lambda: _rename_file(service, b1_id, b2_name))
-        if latest_id:
-            safe("rename latest -> backup-1", lambda: _rename_file(service, latest_id, b1_name))
-
-        upload_backup(
-            user=user,
-            filename=latest_name,
-            content_bytes=content_bytes,
-            mime_type=mime_type,
-            root_name=root_name,
-            subfolder=subfolder,
+        name = _delta_name(ext)
+        try:
+            created = _in_folder(
+                service,
+                user,
+                root_name,
+                subfolder,
+                lambda folder_id: _create_file(
+                    service, user, folder_id, name, content_bytes, mime_type
+                ),
+                retry_lost=False,
+            )
+        finally:
+            invalidate_backup_listing(user)
+        return DriveFile.from_api(created)
+
+    return _wrap_drive_call("upload_backup_delta", _do)
+
+
+def _restore_chain(files: list[DriveFile], target: DriveFile) -> list[DriveFile]:
+    """
+    The files to replay, in order, to get the state `target` was taken at:
+
+    - a full snapshot: itself plus the deltas taken after it (up to the next full one);
+    - a delta: the newest full snapshot before it, then every delta up to `target`;
+    - anything else (manual backups): just `target`.
+    """
+    def key(f: DriveFile):
+        return (f.created_time or datetime.min.replace(tzinfo=dt_timezone.utc), f.name)
+
+    is_delta = target.name.startswith(DELTA_PREFIX)
+    if not is_delta and not _FULL_BACKUP_RE.match(target.name):
+        return [target]
+
+    fulls = sorted((f for f in files if _FULL_BACKUP_RE.match(f.name)), key=key)
+    deltas = sorted((f for f in files if f.name.startswith(DELTA_PREFIX)), key=key)
+
+    if is_delta:
+        base = next((f for f in reversed(fulls) if key(f) < key(target)), None)
+        if base is None:
+            raise DriveError(
+                "This incremental backup has no full backup to start from.", code="broken_chain"
+            )
+        return [base] + [d for d in deltas if key(base) < key(d) <= key(target)]
+
+    next_full = next((f for f in fulls if key(f) > key(target)), None)
+    return [target] + [
+        d for d in deltas if key(target) < key(d) and (next_full is None or key(d) < key(next_full))
+    ]
+
+
+def backup_chain(user, file_id: str) -> list[DriveFile]:
+    """
+    Resolves what restoring `file_id` has to replay (see _restore_chain).
+    One metadata request, plus one folder listing for auto backups.
+    """
+
+    def _do():
+        service = _service(user)
+        meta = _execute(
+            service.files().get(
+                fileId=file_id, fields="id,name,mimeType,size,createdTime,parents"
+            ).execute
         )
+        target = DriveFile.from_api(meta)
+        parents = meta.get("parents") or []
+        if not parents or not target.name.startswith(ROTATION_PREFIX):
+            return [target]
+        files = [DriveFile.from_api(f) for f in _list_folder(service, parents[0], ROTATION_PREFIX)]
+        return _restore_chain(files, target)
+
+    return _wrap_drive_call("backup_chain", _do)
+
 
-    return _wrap_drive_call("upload_backup_rotate_3", _do)
+def upload_backup_rotate_3(
+    user,
+    content_bytes: bytes | IO[bytes],
+    mime_type: str = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ext: str = "csv",
+    root_name: str = ROOT_FOLDER_NAME,
+    subfolder: str | None = BACKUPS_FOLDER_NAME,
+) -> DriveFile:
+    return upload_backup_rotate(
+        user,
+        content_bytes,
+        keep=3,
+        mime_type=mime_type,
+        ext=ext,
+        root_name=root_name,
+        subfolder=subfolder,
+    )
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+from .drive import DriveError, backup_chain, iter_download
+from .models import ImportJob, ImportJobSource, ImportJobStatus
+from .services import ImportFormatError, ImportLimitError, count_csv_rows, import_csv
+
+logger = logging.getLogger(__name__)
+
+STALE_AFTER = timedelta(minutes=30)
+
+
+class _ProgressReporter:
+    """
+    Writes batch progress on a separate autocommit connection.
+
+    The import itself runs in one transaction, so progress saved through the
+    default connection would stay invisible to the polling endpoint until the end.
+    """
+
+    def __init__(self, job: ImportJob):
+        self._job_id = job.id
+        self._conn = connections.create_connection(DEFAULT_DB_ALIAS)
+
+    def __call__(self, created: int, updated: int) -> None:
+        table = ImportJob._meta.db_table
+        try:
+            with self._conn.cursor() as cur:
+                cur.execute(
+                    f"UPDATE {table} SET rows_done = %s, created = %s, updated = %s,"
+                    " updated_at = %s WHERE id = %s",
+                    [created + updated, created, updated, timezone.now(), self._job_id],
+                )
+        except Exception:
+            logger.exception("import job progress update failed job=%s", self._job_id)
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def claim_next_import_job() -> ImportJob | None:
+    """
+    Atomically moves the oldest queued job to RUNNING. SKIP LOCKED lets several
+    workers poll the same queue without handing out a job twice.
+    """
+    with transaction.atomic():
+        job = (
+            ImportJob.objects.select_for_update(skip_locked=True)
+            .filter(status=ImportJobStatus.QUEUED)
+            .order_by("created_at")
+            .first()
+        )
+        if not job:
+            return None
+        job.status = ImportJobStatus.RUNNING
+        job.started_at = timezone.now()
+        job.save(update_fields=["status", "started_at", "updated_at"])
+    return job
+
+
+def fail_stale_import_jobs(now=None) -> int:
+    """
+    Jobs left RUNNING by a worker that died mid-import (its transaction was rolled back).
+
+    Staleness counts from `updated_at`, which _ProgressReporter bumps on every batch,
+    so a long import that is still making progress is left alone.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        stale = list(
+            ImportJob.objects.select_for_update(skip_locked=True).filter(
+                status=ImportJobStatus.RUNNING, updated_at__lt=now - STALE_AFTER
+            )
+        )
+        ImportJob.objects.filter(pk__in=[job.pk for job in stale]).update(
+            status=ImportJobStatus.FAILED,
+            error="Import was interrupted. Please try again.",
+            rows_done=0,
+            created=0,
+            updated=0,
+            file="",
+            finished_at=now,
+            updated_at=now,
+        )
+    # The dead worker never reached its own cleanup.
+    for job in stale:
+        if job.file:
+            job.file.delete(save=False)
+    return len(stale)
+
+
+def _restore_from_drive(job: ImportJob, reporter: _ProgressReporter) -> dict:
+    """
+    Replays the backup chain (full snapshot + deltas) in one transaction.
+    Rows are parsed and upserted while each download is still running.
+    """
+    chain = backup_chain(job.user, job.drive_file_id)
+    totals = {"created": 0, "updated": 0, "deleted": 0}
+    id_map: dict[int, int] = {}
+
+    def progress(created: int, updated: int) -> None:
+        reporter(totals["created"] + created, totals["updated"] + updated)
+
+    with transaction.atomic():
+        for f in chain:
+            result = import_csv(
+                job.user, iter_download(job.user, f.file_id), on_progress=progress, id_map=id_map
+            )
+            for k in totals:
+                totals[k] += result[k]
+    return totals
+
+
+def run_import_job(job: ImportJob) -> ImportJob:
+    reporter = _ProgressReporter(job)
+    try:
+        if job.source == ImportJobSource.UPLOAD:
+            with job.file.open("rb") as fh:
+                job.rows_total = count_csv_rows(fh)
+                job.save(update_fields=["rows_total", "updated_at"])
+                fh.seek(0)
+                result = import_csv(job.user, fh, on_progress=reporter)
+        else:
+            result = _restore_from_drive(job, reporter)
+
+        job.status = ImportJobStatus.DONE
+        job.created = result["created"]
+        job.updated = result["updated"]
+        job.rows_done = job.created + job.updated
+    except (ImportLimitError, ImportFormatError, DriveError) as e:
+        logger.warning("import job failed job=%s user=%s: %s", job.id, job.user_id, e)
+        job.status = ImportJobStatus.FAILED
+        job.error = str(e)
+    except Exception:
+        logger.exception("import job failed job=%s user=%s", job.id, job.user_id)
+        job.status = ImportJobStatus.FAILED
+        job.error = "Import failed. Check the file format and try again."
+    finally:
+        reporter.close()
+
+    if job.status == ImportJobStatus.FAILED:
+        # Nothing was committed, reset the counters the reporter may have written.
+        job.rows_done = job.created = job.updated = 0
+
+    if job.file:
+        job.file.delete(save=False)
+
+    job.finished_at = timezone.now()
+    job.save()
+    return job
@@ -0,0 +1,8 @@
+from __future__ import annotations
+
+from django.utils import timezone
+
+
+def ts() -> str:
+    """Log line prefix shared by the worker commands."""
+    return timezone.localtime().strftime("[%H:%M:%S %d-%m-%Y]")
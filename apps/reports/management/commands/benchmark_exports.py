@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import io
+import time
+import tracemalloc
+from datetime import timedelta
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from openpyxl import Workbook
+
+from apps.applications.models import JobApplication
+from apps.reports.services import EXPORT_FIELDS, export_xlsx, iter_csv, spool_export
+
+
+def _legacy_xlsx(qs) -> bytes:
+    """
+    The pre-streaming implementation (full cell model + BytesIO), kept here as the baseline.
+    """
+    wb = Workbook()
+    ws = wb.active
+    ws.append(list(EXPORT_FIELDS))
+    for a in qs:
+        row = [getattr(a, f) for f in EXPORT_FIELDS]
+        ws.append([v.isoformat() if hasattr(v, "isoformat") else v for v in row])
+    out = io.BytesIO()
+    wb.save(out)
+    return out.getvalue()
+
+
+def _measure(fn) -> tuple[float, float, int]:
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    size = fn()
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024), size
+
+
+class Command(BaseCommand):
+    """
+    Measures export time and peak Python heap (tracemalloc) on synthetic data.
+
+      python manage.py benchmark_exports --rows 10000 --rows 100000
+
+    Rows are created for a throwaway user inside a transaction that is rolled back.
+    """
+
+    help = "Benchmark CSV/XLSX export memory and time."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--rows", type=int, action="append", help="Row count (repeatable).")
+        parser.add_argument(
+            "--legacy", action="store_true", help="Also run the in-memory XLSX baseline."
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        sizes = options["rows"] or [10_000, 100_000]
+
+        for n in sizes:
+            with transaction.atomic():
+                user = get_user_model().objects.create_user(
+                    username=f"bench-{time.time_ns()}", password=None
+                )
+                now = timezone.now()
+                JobApplication.objects.bulk_create(
+                    (
+                        JobApplication(
+                            user=user,
+                            title=f"Software Engineer {i}",
+                            company=f"Company {i % 500}",
+                            location="Berlin",
+                            source="LinkedIn",
+                            applied_at=now - timedelta(minutes=i),
+                            notes="Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4,
+                        )
+                        for i in range(n)
+                    ),
+                    batch_size=5000,
+                )
+                qs = JobApplication.objects.filter(user=user).order_by("id")
+
+                def run_csv():
+                    with spool_export(iter_csv(qs)) as fh:
+                        fh.seek(0, io.SEEK_END)
+                        return fh.tell()
+
+                def run_xlsx():
+                    with export_xlsx(qs) as fh:
+                        fh.seek(0, io.SEEK_END)
+                        return fh.tell()
+
+                runs = [("csv (streamed)", run_csv), ("xlsx (write-only)", run_xlsx)]
+                if options["legacy"]:
+                    runs.append(("xlsx (legacy in-memory)", lambda: len(_legacy_xlsx(qs))))
+
+                for label, fn in runs:
+                    elapsed, peak_mb, size = _measure(fn)
+                    self.stdout.write(
+                        f"rows={n:>7} {label:<24} time={elapsed:7.2f}s "
+                        f"peak_heap={peak_mb:8.1f} MiB "
+                        f"output={size / (1024 * 1024):6.1f} MiB"
+                    )
+
+                transaction.set_rollback(True)
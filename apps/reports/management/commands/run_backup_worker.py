@@ -1,43 +1,106 @@
 from __future__ import annotations
 
-from django.db import connection
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from django.conf import settings
+from django.db import close_old_connections, connection, connections, transaction
+from django.db.models import Case, F, Min, Q, Value, When
 from datetime import timedelta
 from django.core.management.base import BaseCommand
-from apps.reports.models import CloudBackupSettings
-from apps.reports.drive import get_drive_status, upload_backup_rotate_3
-from apps.reports.services import export_csv
+from apps.reports.models import (
+    BACKUP_DEBOUNCE,
+    BackupTombstone,
+    CloudBackupSettings,
+    next_backup_due,
+)
+from apps.reports.drive import (
+    DriveError,
+    drive_call_stats,
+    get_drive_status,
+    upload_backup_delta,
+    upload_backup_rotate,
+)
+from apps.reports.services import export_fingerprint, gzip_chunks, iter_csv, spool_export
+from apps.reports.management.commands._utils import ts
 from apps.applications.models import JobApplication
 from django.utils import timezone
 
 import logging
+import threading
 import time
 
 logger = logging.getLogger(__name__)
 
-def _ts() -> str:
-    return timezone.localtime().strftime("[%H:%M:%S %d-%m-%Y]")
+# Due rows picked up per tick, never more than free pool slots: a claimed row
+# is leased, so rows queued behind busy threads would be held but not served.
+# A tick that fills every slot is followed by the next one right away.
+DUE_BATCH_SIZE = 50
+MIN_SLEEP_SECONDS = 1
+# How often _wait_for looks again for a submitted user that hasn't started yet.
+START_POLL_SECONDS = 1.0
+MAX_SLEEP_SECONDS = 60
+# Deltas re-export rows updated slightly before the last watermark: import_csv
+# stamps updated_at before its transaction commits, so such rows can become
+# visible after the export that should have seen them. Re-applying is harmless.
+DELTA_OVERLAP = timedelta(minutes=5)
 
-INTERVAL_SECONDS = 30
-BACKUP_EVERY = timedelta(minutes=5)
+
+def _unleased(now) -> Q:
+    # No worker holds the row, or the one that did stopped renewing its lease.
+    return Q(leased_until__isnull=True) | Q(leased_until__lt=now)
+
+
+def _schedule(qs, now):
+    # Only stored columns here: the due query must stay on cloudbackup_next_due_idx.
+    return qs.filter(enabled=True).filter(_unleased(now))
 
 
 class Command(BaseCommand):
-    help = "Runs a lightweight loop that performs Google Drive auto backups (latest + 2) every 5 minutes."
+    help = (
+        "Runs a lightweight loop that performs rotated Google Drive auto backups "
+        "shortly after users change their data."
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._concurrency = settings.BACKUP_CONCURRENCY
+        self._pool: ThreadPoolExecutor | None = None
+        # Written by pool threads (done callbacks): only touch it under the lock,
+        # and hand queries a snapshot.
+        self._in_flight: set[int] = set()
+        # user_id -> time.monotonic() when its pool thread picked it up.
+        self._started: dict[int, float] = {}
+        self._in_flight_lock = threading.Lock()
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=None,
+            help="Users backed up in parallel (default: BACKUP_CONCURRENCY).",
+        )
 
     def handle(self, *args, **options):
+        if options.get("concurrency"):
+            self._concurrency = max(options["concurrency"], 1)
+
         self.stdout.write(self.style.SUCCESS(
-            f"{_ts()} Auto-backup worker started (tick={INTERVAL_SECONDS}s, backup={BACKUP_EVERY})."
+            f"{ts()} Auto-backup worker started (debounce={BACKUP_DEBOUNCE}, "
+            f"interval={settings.BACKUP_INTERVAL_MINUTES}m default, "
+            f"max_sleep={MAX_SLEEP_SECONDS}s, "
+            f"concurrency={self._concurrency})."
         ))
 
         self._wait_until_table_exists("reports_cloudbackupsettings", timeout_seconds=120)
 
         while True:
             try:
-                self._tick()
+                saturated = self._tick()
+                delay = 0 if saturated else self._seconds_until_next_due()
             except Exception as e:
-                self.stderr.write(self.style.ERROR(f"{_ts()} tick error: {e!r}"))
+                self.stderr.write(self.style.ERROR(f"{ts()} tick error: {e!r}"))
+                delay = MAX_SLEEP_SECONDS
 
-            time.sleep(INTERVAL_SECONDS)
+            time.sleep(delay)
 
     def _wait_until_table_exists(self, table_name: str, timeout_seconds: int = 120) -> None:
         """
@@ -53,60 +116,324 @@ class Command(BaseCommand):
                     )
                     ok = cursor.fetchone() is not None
                 if ok:
-                    self.stdout.write(f"{_ts()} migrations ready: table '{table_name}' exists")
+                    self.stdout.write(f"{ts()} migrations ready: table '{table_name}' exists")
                     return
             except Exception:
                 pass
 
-            self.stdout.write(f"{_ts()} waiting for migrations...")
+            self.stdout.write(f"{ts()} waiting for migrations...")
             time.sleep(2)
 
-        raise RuntimeError(f"{_ts()} Timeout: table '{table_name}' did not appear in {timeout_seconds}s")
+        raise RuntimeError(
+            f"{ts()} Timeout: table '{table_name}' did not appear in {timeout_seconds}s"
+        )
 
-    def _tick(self):
+    def _claim_due_rows(self, now, limit: int | None = None) -> list[CloudBackupSettings]:
+        """
+        Leases up to `limit` (default DUE_BATCH_SIZE) enabled rows whose interval
+        has passed, most overdue first (never run = first).
+
+        SKIP LOCKED keeps concurrent workers from claiming the same rows; the
+        lease (`leased_until`) keeps them off the row after this transaction
+        commits, until the run finishes or the lease runs out because this
+        worker died.
+        """
+        limit = DUE_BATCH_SIZE if limit is None else limit
+        lease_until = now + timedelta(seconds=settings.BACKUP_LEASE_SECONDS)
+        with transaction.atomic():
+            due = (
+                _schedule(CloudBackupSettings.objects.select_related("user"), now)
+                .select_for_update(skip_locked=True, of=("self",))
+                .exclude(user_id__in=self._running())
+            )
+            # Two range lookups on cloudbackup_next_due_idx rather than one OR,
+            # which the planner can't turn into a bounded index scan.
+            rows = list(due.filter(next_due_at__isnull=True).order_by("id")[:limit])
+            if len(rows) < limit:
+                rows += due.filter(next_due_at__lte=now).order_by("next_due_at", "id")[
+                    : limit - len(rows)
+                ]
+            if rows:
+                CloudBackupSettings.objects.filter(pk__in=[r.pk for r in rows]).update(
+                    leased_until=lease_until
+                )
+                for r in rows:
+                    r.leased_until = lease_until
+        return rows
+
+    def _renew_leases(self, now) -> None:
+        """
+        Users still running past BACKUP_USER_TIMEOUT keep their lease while this worker is alive.
+        """
+        running = self._running()
+        if running:
+            CloudBackupSettings.objects.filter(user_id__in=running).update(
+                leased_until=now + timedelta(seconds=settings.BACKUP_LEASE_SECONDS)
+            )
+
+    @staticmethod
+    def _renew_lease(s: CloudBackupSettings) -> None:
+        CloudBackupSettings.objects.filter(pk=s.pk).update(
+            leased_until=timezone.now() + timedelta(seconds=settings.BACKUP_LEASE_SECONDS)
+        )
+
+    def _seconds_until_next_due(self) -> float:
+        """
+        Sleep until the earliest row comes due, within [MIN_SLEEP_SECONDS, MAX_SLEEP_SECONDS].
+        The cap is how long a newly enabled user may wait for the first backup.
+        Rows leased by another worker don't count; they are due again once released.
+        """
+        now = timezone.now()
+        qs = _schedule(CloudBackupSettings.objects.all(), now).exclude(user_id__in=self._running())
+        if qs.filter(next_due_at__isnull=True).exists():
+            return MIN_SLEEP_SECONDS
+        soonest = qs.aggregate(soonest=Min("next_due_at"))["soonest"]
+        if soonest is None:
+            return MAX_SLEEP_SECONDS
+
+        remaining = (soonest - now).total_seconds()
+        return min(max(remaining, MIN_SLEEP_SECONDS), MAX_SLEEP_SECONDS)
+
+    def _free_slots(self) -> int:
+        # Users stuck past BACKUP_USER_TIMEOUT still hold a pool thread.
+        return min(max(self._concurrency - len(self._running()), 0), DUE_BATCH_SIZE)
+
+    def _tick(self) -> bool:
+        """
+        One round of backups. Returns True when it used every free slot, so more
+        due rows may be waiting.
+        """
         now = timezone.now()
-        qs = CloudBackupSettings.objects.select_related("user").filter(enabled=True)
+        self._renew_leases(now)
+        limit = self._free_slots()
+        due_rows = self._claim_due_rows(now, limit) if limit else []
+        if due_rows:
+            self.stdout.write(f"{ts()} {len(due_rows)} user(s) due")
 
-        if not qs.exists():
-            self.stdout.write(self.style.WARNING(f"{_ts()} no users with auto-backup enabled"))
+        self._run_backups(due_rows, now)
+
+        stats = drive_call_stats(reset=True)
+        if stats["calls"]:
+            self.stdout.write(
+                f"{ts()} drive calls={stats['calls']} retries={stats['retries']} "
+                f"retry_sleep={stats['retry_sleep']}s throttled={stats['throttle_sleep']}s "
+                f"gave_up={stats['gave_up']}"
+            )
+        return bool(due_rows) and len(due_rows) == limit
+
+    def _run_backups(self, rows: list[CloudBackupSettings], now) -> None:
+        """
+        Backs up `rows` on the thread pool (inline when concurrency is 1) and waits
+        for each user up to BACKUP_USER_TIMEOUT from when it started. Users still
+        running after that are left to finish in the background; they stay in
+        `_in_flight`, so the next tick neither starts them twice nor counts their
+        thread as free. Drive calls themselves time out after DRIVE_HTTP_TIMEOUT,
+        so a stuck thread frees up eventually.
+        """
+        if not rows:
+            return
+
+        if self._concurrency <= 1:
+            for s in rows:
+                self._backup_user(s, now)
             return
 
-        for s in qs:
-            user = s.user
-            due = (s.last_run_at is None) or (now - s.last_run_at >= BACKUP_EVERY)
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self._concurrency, thread_name_prefix="backup"
+            )
+
+        futures = {}
+        for s in rows:
+            with self._in_flight_lock:
+                self._in_flight.add(s.user_id)
+            future = self._pool.submit(self._backup_user_isolated, s, now)
+            future.add_done_callback(lambda _f, user_id=s.user_id: self._finished(user_id))
+            futures[future] = s
+
+        self._wait_for(futures)
+
+    def _wait_for(self, futures: dict) -> None:
+        timeout = settings.BACKUP_USER_TIMEOUT
+        pending = set(futures)
+        while pending:
+            now = time.monotonic()
+            left = {}
+            for future in pending:
+                started = self._started_at(futures[future].user_id)
+                left[future] = None if started is None else started + timeout - now
+
+            for future, seconds in left.items():
+                if seconds is not None and seconds <= 0 and not future.done():
+                    self.stderr.write(self.style.WARNING(
+                        f"{ts()} user={futures[future].user_id} still running after "
+                        f"{timeout}s, continuing without it"
+                    ))
+                    pending.discard(future)
+            if not pending:
+                return
+
+            waits = [seconds for f, seconds in left.items() if f in pending and seconds is not None]
+            if len(waits) < len(pending):
+                waits.append(START_POLL_SECONDS)
+            _, pending = wait(pending, timeout=max(min(waits), 0), return_when=FIRST_COMPLETED)
+
+    def _running(self) -> frozenset[int]:
+        with self._in_flight_lock:
+            return frozenset(self._in_flight)
 
-            if not due:
-                remaining_seconds = max(int((BACKUP_EVERY - (now - s.last_run_at)).total_seconds()), 0)
-                remaining = timedelta(seconds=remaining_seconds)
-                self.stdout.write(f"{_ts()} user={user.id} skip (not due, remaining to next check={remaining})")
-                continue
+    def _started_at(self, user_id: int) -> float | None:
+        with self._in_flight_lock:
+            return self._started.get(user_id)
+
+    def _finished(self, user_id: int) -> None:
+        with self._in_flight_lock:
+            self._in_flight.discard(user_id)
+            self._started.pop(user_id, None)
+
+    def _backup_user_isolated(self, s: CloudBackupSettings, now) -> None:
+        # Pool threads get their own DB connection (Django connections are
+        # per thread); close it after every user so nothing lingers between jobs.
+        with self._in_flight_lock:
+            self._started[s.user_id] = time.monotonic()
+        close_old_connections()
+        try:
+            self._backup_user(s, now)
+        finally:
+            connections.close_all()
+
+    def _backup_user(self, s: CloudBackupSettings, now) -> None:
+        user = s.user
+        try:
+            apps_qs = JobApplication.objects.filter(user=user).order_by("id")
+            ext, mime_type = ("csv", "text/csv")
+            if settings.DRIVE_BACKUP_GZIP:
+                ext, mime_type = ("csv.gz", "application/gzip")
+
+            # Taken before the export: edits made meanwhile still differ next tick
+            # and fall after the delta watermark.
+            export_started = timezone.now()
+            fingerprint = export_fingerprint(apps_qs, ext)
+            if fingerprint == s.backup_fingerprint:
+                self.stdout.write(f"{ts()} user={user.id} skip (no changes since last backup)")
+                self._mark_run(s, now, clean=True)
+                return
 
             drive_status = get_drive_status(user)
             if not (drive_status.get("connected") and drive_status.get("has_refresh_token")):
-                self.stdout.write(self.style.WARNING(f"{_ts()} user={user.id} disabled (drive not connected)"))
+                self.stdout.write(
+                    self.style.WARNING(f"{ts()} user={user.id} disabled (drive not connected)")
+                )
                 s.enabled = False
-                s.save(update_fields=["enabled", "updated_at"])
-                continue
+                s.leased_until = None
+                s.save(update_fields=["enabled", "leased_until", "updated_at"])
+                return
 
+            full = self._needs_full_backup(s, export_started)
             try:
-                apps_qs = JobApplication.objects.filter(user=user).order_by("id")
+                self._export_and_upload(s, apps_qs, full=full, ext=ext, mime_type=mime_type)
+            except DriveError as e:
+                # The folder holding the snapshot is gone: a delta in a new folder
+                # would start a chain with no base, so send a full backup instead.
+                if full or e.code != "folder_lost":
+                    raise
+                self.stdout.write(self.style.WARNING(
+                    f"{ts()} user={user.id} backups folder lost, sending a full backup"
+                ))
+                full = True
+                self._export_and_upload(s, apps_qs, full=full, ext=ext, mime_type=mime_type)
 
-                content = export_csv(apps_qs) # backup file type
+            if full:
+                # Deletions before the snapshot are in it; later deltas don't need them.
+                BackupTombstone.objects.filter(
+                    user=user, deleted_at__lte=export_started - DELTA_OVERLAP
+                ).delete()
+                chain = {"last_full_backup_at": export_started, "deltas_since_full": 0}
+            else:
+                chain = {"deltas_since_full": F("deltas_since_full") + 1}
+            self._mark_run(
+                s,
+                now,
+                clean=True,
+                backup_fingerprint=fingerprint,
+                backup_watermark=export_started,
+                **chain,
+            )
 
-                upload_backup_rotate_3(
-                         user = user,
-                         content_bytes = content,
-                         ext = "csv",
-                         mime_type = "text/csv",
-                     )
+            self.stdout.write(self.style.SUCCESS(
+                f"{ts()} user={user.id} Autobackup uploaded + rotated" if full
+                else f"{ts()} user={user.id} Delta backup uploaded"
+            ))
 
-                s.last_run_at = now
-                s.save(update_fields=["last_run_at", "updated_at"])
+        except Exception as e:
+            self.stderr.write(self.style.ERROR(f"{ts()} user={user.id} ERROR: {e!r}"))
+            # Stays dirty, retried after the user's interval rather than on every wake-up.
+            # Whatever made it to Drive is unknown, so the retry is a full backup.
+            self._mark_run(s, now, clean=False, backup_watermark=None)
 
-                self.stdout.write(
-                    self.style.SUCCESS(f"{_ts()} user={user.id} Autobackup uploaded + rotated")
+    def _export_and_upload(
+        self, s: CloudBackupSettings, apps_qs, *, full: bool, ext: str, mime_type: str
+    ) -> None:
+        user = s.user
+        if full:
+            chunks = iter_csv(apps_qs)
+        else:
+            since = s.backup_watermark - DELTA_OVERLAP
+            deleted_ids = BackupTombstone.objects.filter(
+                user=user, deleted_at__gt=since
+            ).values_list("application_id", flat=True)
+            chunks = iter_csv(apps_qs.filter(updated_at__gt=since), deleted_ids=deleted_ids)
+        if settings.DRIVE_BACKUP_GZIP:
+            chunks = gzip_chunks(chunks)
+
+        # Export is fully spooled before upload, so the DB cursor is closed
+        # while we wait on Drive.
+        with spool_export(chunks) as content:
+            # Inline runs (concurrency 1) get no tick to renew the lease, and
+            # the export may have used most of it: start the upload with a fresh one.
+            self._renew_lease(s)
+            if full:
+                upload_backup_rotate(
+                    user=user,
+                    content_bytes=content,
+                    keep=s.keep,
+                    ext=ext,
+                    mime_type=mime_type,
                 )
+            else:
+                upload_backup_delta(user=user, content_bytes=content, ext=ext, mime_type=mime_type)
 
-            except Exception as e:
-                self.stderr.write(self.style.ERROR(f"{_ts()} user={user.id} ERROR: {e!r}"))
+    @staticmethod
+    def _needs_full_backup(s: CloudBackupSettings, now) -> bool:
+        if (
+            not settings.DRIVE_BACKUP_DELTAS
+            or s.backup_watermark is None
+            or s.last_full_backup_at is None
+        ):
+            return True
+        # Cleared when the Drive folder was lost (drive._forget_folder_ids).
+        if not s.backup_fingerprint:
+            return True
+        max_age = timedelta(hours=settings.DRIVE_BACKUP_FULL_MAX_AGE_HOURS)
+        return (
+            s.deltas_since_full >= settings.DRIVE_BACKUP_FULL_EVERY
+            or now - s.last_full_backup_at >= max_age
+        )
 
+    @staticmethod
+    def _mark_run(s: CloudBackupSettings, now, *, clean: bool, **fields) -> None:
+        """
+        Moves the row's due time and releases the lease. `clean` clears the
+        dirty flag unless the user changed something after the run started.
+        Queryset update, so concurrent mark_backup_dirty() calls aren't overwritten.
+        """
+        if clean:
+            fields["dirty_since"] = Case(
+                When(changed_at__gt=now, then=F("dirty_since")), default=None
+            )
+        next_due_at = next_backup_due(
+            last_run_at=Value(now), dirty_since=fields.get("dirty_since", F("dirty_since"))
+        )
+        CloudBackupSettings.objects.filter(pk=s.pk).update(
+            last_run_at=now, leased_until=None, next_due_at=next_due_at, **fields
+        )
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.reports.jobs import claim_next_import_job, fail_stale_import_jobs, run_import_job
+from apps.reports.management.commands._utils import ts
+
+IDLE_SLEEP_SECONDS = 2
+STALE_CHECK_EVERY = 60
+
+
+class Command(BaseCommand):
+    help = "Processes queued CSV imports and Google Drive restores (ImportJob)."
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS(
+            f"{ts()} Import worker started (idle poll={IDLE_SLEEP_SECONDS}s)."
+        ))
+
+        last_stale_check = 0.0
+        while True:
+            try:
+                close_old_connections()
+
+                if time.monotonic() - last_stale_check >= STALE_CHECK_EVERY:
+                    failed = fail_stale_import_jobs()
+                    if failed:
+                        self.stdout.write(
+                            self.style.WARNING(f"{ts()} marked {failed} stale job(s) failed")
+                        )
+                    last_stale_check = time.monotonic()
+
+                job = claim_next_import_job()
+                if not job:
+                    time.sleep(IDLE_SLEEP_SECONDS)
+                    continue
+
+                self.stdout.write(
+                    f"{ts()} job={job.id} user={job.user_id} source={job.source} started"
+                )
+                job = run_import_job(job)
+                self.stdout.write(
+                    f"{ts()} job={job.id} user={job.user_id} {job.status} "
+                    f"(created={job.created}, updated={job.updated})"
+                )
+            except Exception as e:
+                self.stderr.write(self.style.ERROR(f"{ts()} import worker error: {e!r}"))
+                time.sleep(IDLE_SLEEP_SECONDS)
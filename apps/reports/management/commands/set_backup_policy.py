@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.reports.models import (
+    CloudBackupSettings,
+    clamp_backup_interval,
+    clamp_backup_keep,
+    next_backup_due,
+)
+
+
+class Command(BaseCommand):
+    """
+    Set a user's auto backup interval and retention.
+
+    Typical use:
+      python manage.py set_backup_policy --email heavy@example.com --interval 60 --keep 2
+      python manage.py set_backup_policy --email heavy@example.com --interval default
+
+    Notes:
+    - Values outside the server limits (BACKUP_INTERVAL_MIN/MAX_MINUTES,
+      DRIVE_BACKUP_KEEP_MAX) are clamped, here and again by the worker.
+    - "default" clears the override, so the user follows the server default.
+    """
+
+    help = "Set per-user auto backup interval (minutes) and retention."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--email", required=True, help="User email (must exist in DB).")
+        parser.add_argument("--interval", help='Minutes between backups, or "default".')
+        parser.add_argument("--keep", help='Rotated backups kept on Drive, or "default".')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        User = get_user_model()
+        try:
+            user = User.objects.get(email=options["email"])
+        except User.DoesNotExist as exc:
+            raise CommandError(f"User with email '{options['email']}' not found.") from exc
+
+        fields: dict[str, int | None] = {}
+        if options["interval"] is not None:
+            fields["backup_interval_minutes"] = self._value(
+                options["interval"], clamp_backup_interval, "--interval"
+            )
+        if options["keep"] is not None:
+            fields["backup_keep"] = self._value(options["keep"], clamp_backup_keep, "--keep")
+
+        s, _ = CloudBackupSettings.objects.get_or_create(user=user)
+        if fields:
+            for name, value in fields.items():
+                setattr(s, name, value)
+            s.save(update_fields=[*fields, "updated_at"])
+            if "backup_interval_minutes" in fields:
+                # The stored due time was computed with the old interval.
+                CloudBackupSettings.objects.filter(pk=s.pk).update(
+                    next_due_at=next_backup_due()
+                )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"user_id={user.id}: backup every {s.interval} (override={s.backup_interval_minutes}), "
+            f"keep {s.keep} (override={s.backup_keep}); "
+            f"limits interval={settings.BACKUP_INTERVAL_MIN_MINUTES}"
+            f"-{settings.BACKUP_INTERVAL_MAX_MINUTES}m "
+            f"keep=1-{settings.DRIVE_BACKUP_KEEP_MAX}"
+        ))
+
+    @staticmethod
+    def _value(raw: str, clamp, flag: str) -> int | None:
+        if raw == "default":
+            return None
+        try:
+            return clamp(int(raw))
+        except ValueError as exc:
+            raise CommandError(f'{flag} must be a number or "default".') from exc
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:51
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportJob',
+            fields=[
+                ('id', models.BigAutoField(
+                    auto_created=True, primary_key=True, serialize=False, verbose_name='ID'
+                )),
+                ('source', models.CharField(
+                    choices=[('upload', 'CSV upload'), ('drive', 'Google Drive restore')],
+                    max_length=16,
+                )),
+                ('status', models.CharField(
+                    choices=[
+                        ('queued', 'Queued'),
+                        ('running', 'Running'),
+                        ('done', 'Done'),
+                        ('failed', 'Failed'),
+                    ],
+                    default='queued',
+                    max_length=16,
+                )),
+                ('file', models.FileField(blank=True, upload_to='imports/%Y/%m/')),
+                ('drive_file_id', models.CharField(blank=True, max_length=128)),
+                ('filename', models.CharField(blank=True, max_length=255)),
+                ('rows_total', models.PositiveIntegerField(blank=True, null=True)),
+                ('rows_done', models.PositiveIntegerField(default=0)),
+                ('created', models.PositiveIntegerField(default=0)),
+                ('updated', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name='import_jobs',
+                    to=settings.AUTH_USER_MODEL,
+                )),
+            ],
+            options={
+                'indexes': [
+                    models.Index(
+                        fields=['status', 'created_at'], name='reports_imp_status_f8132f_idx'
+                    ),
+                    models.Index(
+                        fields=['user', 'created_at'], name='reports_imp_user_id_94098f_idx'
+                    ),
+                ],
+            },
+        ),
+    ]
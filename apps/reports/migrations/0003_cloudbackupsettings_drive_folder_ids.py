@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0002_importjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cloudbackupsettings',
+            name='drive_backups_folder_id',
+            field=models.CharField(blank=True, max_length=128),
+        ),
+        migrations.AddField(
+            model_name='cloudbackupsettings',
+            name='drive_root_folder_id',
+            field=models.CharField(blank=True, max_length=128),
+        ),
+    ]
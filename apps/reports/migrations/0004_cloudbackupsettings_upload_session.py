@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0003_cloudbackupsettings_drive_folder_ids'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cloudbackupsettings',
+            name='upload_session_key',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='cloudbackupsettings',
+            name='upload_session_uri',
+            field=models.TextField(blank=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0004_cloudbackupsettings_upload_session'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cloudbackupsettings',
+            name='backup_fingerprint',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0005_cloudbackupsettings_backup_fingerprint'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cloudbackupsettings',
+            index=models.Index(
+                models.OrderBy(models.F('last_run_at'), nulls_first=True),
+                condition=models.Q(('enabled', True)),
+                name='cloudbackup_due_idx',
+            ),
+        ),
+    ]
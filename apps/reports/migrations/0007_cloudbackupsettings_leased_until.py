@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0006_cloudbackupsettings_due_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cloudbackupsettings',
+            name='leased_until',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
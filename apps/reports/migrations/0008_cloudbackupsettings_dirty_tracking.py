@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0007_cloudbackupsettings_leased_until'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cloudbackupsettings',
+            name='changed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='cloudbackupsettings',
+            name='dirty_since',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0009_delta_backups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cloudbackupsettings',
+            name='backup_interval_minutes',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='cloudbackupsettings',
+            name='backup_keep',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0010_cloudbackupsettings_policy'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='cloudbackupsettings',
+            name='cloudbackup_due_idx',
+        ),
+        # Existing rows start out due (NULL): the worker checks each enabled user
+        # once, which is a no-op without changes, and stores the real due time.
+        migrations.AddField(
+            model_name='cloudbackupsettings',
+            name='next_due_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='cloudbackupsettings',
+            index=models.Index(
+                models.OrderBy(models.F('next_due_at'), nulls_first=True),
+                condition=models.Q(('enabled', True)),
+                name='cloudbackup_next_due_idx',
+            ),
+        ),
+    ]
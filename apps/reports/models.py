@@ -1,7 +1,95 @@
 from __future__ import annotations
 
+from datetime import timedelta
+
 from django.conf import settings
 from django.db import models
+from django.db.models import (
+    Case,
+    DateTimeField,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    Q,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Greatest, Least
+from django.db.models.lookups import IsNull
+
+# Change-driven schedule (CloudBackupSettings.dirty_since/changed_at):
+# a dirty user is backed up once edits have been quiet for BACKUP_DEBOUNCE,
+# or one interval after the first unsaved edit if they keep editing, but never
+# more often than once per interval (per user, CloudBackupSettings.interval).
+# Clean users are only re-checked (a cheap fingerprint query) every
+# BACKUP_RECHECK_EVERY, which catches writes that bypass dirty tracking.
+BACKUP_DEBOUNCE = timedelta(minutes=2)
+BACKUP_RECHECK_EVERY = timedelta(days=1)
+
+
+def clamp_backup_interval(minutes: int | None) -> int:
+    """
+    Per-user backup interval in minutes: the server default when unset, always
+    within BACKUP_INTERVAL_MIN_MINUTES..BACKUP_INTERVAL_MAX_MINUTES.
+    """
+    if minutes is None:
+        minutes = settings.BACKUP_INTERVAL_MINUTES
+    return min(
+        max(minutes, settings.BACKUP_INTERVAL_MIN_MINUTES), settings.BACKUP_INTERVAL_MAX_MINUTES
+    )
+
+
+def clamp_backup_keep(keep: int | None) -> int:
+    """
+    Per-user retention (rotated auto backups kept), within 1..DRIVE_BACKUP_KEEP_MAX.
+    """
+    if keep is None:
+        keep = settings.DRIVE_BACKUP_KEEP
+    return min(max(keep, 1), settings.DRIVE_BACKUP_KEEP_MAX)
+
+
+def _interval_sql():
+    """
+    The row's backup interval as SQL, clamped like CloudBackupSettings.interval,
+    so a stored value outside the current server limits is still honoured safely.
+    """
+    minutes = Greatest(
+        Least(
+            Coalesce(F("backup_interval_minutes"), Value(settings.BACKUP_INTERVAL_MINUTES)),
+            Value(settings.BACKUP_INTERVAL_MAX_MINUTES),
+        ),
+        Value(settings.BACKUP_INTERVAL_MIN_MINUTES),
+    )
+    return ExpressionWrapper(minutes * Value(timedelta(minutes=1)), output_field=DurationField())
+
+
+def next_backup_due(
+    *, last_run_at=F("last_run_at"), dirty_since=F("dirty_since"), changed_at=F("changed_at")
+):
+    """
+    CloudBackupSettings.next_due_at as a SQL expression, for the UPDATE that
+    changes its inputs. SET only sees the old row, so pass the values that
+    UPDATE writes; the rest are read from the row.
+
+    NULL for rows that never ran: due right away. GREATEST/LEAST skip NULLs in
+    PostgreSQL.
+    """
+    interval = _interval_sql()
+    dirty_due = Case(
+        When(
+            IsNull(dirty_since, False),
+            then=Greatest(
+                last_run_at + interval,
+                Least(changed_at + BACKUP_DEBOUNCE, dirty_since + interval),
+            ),
+        ),
+        default=None,
+        output_field=DateTimeField(),
+    )
+    due = Least(last_run_at + BACKUP_RECHECK_EVERY, dirty_due, output_field=DateTimeField())
+    return Case(
+        When(IsNull(last_run_at, True), then=None), default=due, output_field=DateTimeField()
+    )
 
 
 class CloudBackupSettings(models.Model):
@@ -12,6 +100,38 @@ class CloudBackupSettings(models.Model):
     enabled = models.BooleanField(default=False)
     last_run_at = models.DateTimeField(null=True, blank=True)
 
+    # Per-user schedule and retention; empty means the server default. Both are
+    # clamped to the server limits when used (clamp_backup_interval/_keep).
+    backup_interval_minutes = models.PositiveIntegerField(null=True, blank=True)
+    backup_keep = models.PositiveSmallIntegerField(null=True, blank=True)
+
+    # Resolved JobApply/backups folder ids, cleared when Drive answers 404.
+    drive_root_folder_id = models.CharField(max_length=128, blank=True)
+    drive_backups_folder_id = models.CharField(max_length=128, blank=True)
+
+    # In-flight resumable upload, so a retry continues from the last confirmed byte.
+    upload_session_uri = models.TextField(blank=True)
+    upload_session_key = models.CharField(max_length=64, blank=True)
+
+    # export_fingerprint() of the data in the last successful auto backup.
+    backup_fingerprint = models.CharField(max_length=64, blank=True)
+
+    # Set while a backup worker owns the row; an expired lease means the worker died.
+    leased_until = models.DateTimeField(null=True, blank=True)
+
+    # Dirty tracking (services.mark_backup_dirty): first change not yet backed up, latest change.
+    dirty_since = models.DateTimeField(null=True, blank=True)
+    changed_at = models.DateTimeField(null=True, blank=True)
+    # When the worker should look at the row next (see next_backup_due), kept up
+    # to date by every write to its inputs; NULL = due now.
+    next_due_at = models.DateTimeField(null=True, blank=True)
+
+    # Delta backups: start of the last successful export (next delta covers rows
+    # updated after it), and when the current chain's full snapshot was taken.
+    backup_watermark = models.DateTimeField(null=True, blank=True)
+    last_full_backup_at = models.DateTimeField(null=True, blank=True)
+    deltas_since_full = models.PositiveIntegerField(default=0)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -19,7 +139,106 @@ class CloudBackupSettings(models.Model):
         indexes = [
             models.Index(fields=["enabled"]),
             models.Index(fields=["last_run_at"]),
+            # Backup worker due query: enabled rows, never-run first, then soonest due.
+            models.Index(
+                F("next_due_at").asc(nulls_first=True),
+                name="cloudbackup_next_due_idx",
+                condition=Q(enabled=True),
+            ),
         ]
 
+    @property
+    def interval(self) -> timedelta:
+        return timedelta(minutes=clamp_backup_interval(self.backup_interval_minutes))
+
+    @property
+    def keep(self) -> int:
+        return clamp_backup_keep(self.backup_keep)
+
     def __str__(self) -> str:
         return f"CloudBackupSettings(user_id={self.user_id}, enabled={self.enabled})"
+
+
+class BackupTombstone(models.Model):
+    """
+    A deleted JobApplication, kept until the next full backup so delta backups
+    can carry the deletion. Only recorded while auto backups are enabled.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+")
+    application_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "deleted_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"BackupTombstone(user_id={self.user_id}, application_id={self.application_id})"
+
+
+class ImportJobStatus(models.TextChoices):
+    QUEUED = "queued", "Queued"
+    RUNNING = "running", "Running"
+    DONE = "done", "Done"
+    FAILED = "failed", "Failed"
+
+
+class ImportJobSource(models.TextChoices):
+    UPLOAD = "upload", "CSV upload"
+    DRIVE = "drive", "Google Drive restore"
+
+
+class ImportJob(models.Model):
+    """
+    A queued CSV import / Drive restore, processed by `run_import_worker`.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="import_jobs"
+    )
+    source = models.CharField(max_length=16, choices=ImportJobSource.choices)
+    status = models.CharField(
+        max_length=16, choices=ImportJobStatus.choices, default=ImportJobStatus.QUEUED
+    )
+
+    file = models.FileField(upload_to="imports/%Y/%m/", blank=True)
+    drive_file_id = models.CharField(max_length=128, blank=True)
+    filename = models.CharField(max_length=255, blank=True)
+
+    rows_total = models.PositiveIntegerField(null=True, blank=True)
+    rows_done = models.PositiveIntegerField(default=0)
+    created = models.PositiveIntegerField(default=0)
+    updated = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "created_at"]),
+            models.Index(fields=["user", "created_at"]),
+        ]
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in (ImportJobStatus.QUEUED, ImportJobStatus.RUNNING)
+
+    def as_progress(self) -> dict:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "source": self.source,
+            "filename": self.filename,
+            "rows_done": self.rows_done,
+            "rows_total": self.rows_total,
+            "created": self.created,
+            "updated": self.updated,
+            "error": self.error,
+            "finished": not self.is_active,
+        }
+
+    def __str__(self) -> str:
+        return f"ImportJob(id={self.id}, user_id={self.user_id}, status={self.status})"
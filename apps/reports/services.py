@@ -1,118 +1,568 @@
 from __future__ import annotations
 
+import codecs
 import csv
-import io
-from dataclasses import dataclass
-from datetime import datetime
+import hashlib
+import tempfile
+import time
+import zlib
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from itertools import chain, islice
 
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Aggregate, Count, DurationField, ExpressionWrapper, F, Max, Q, Value
+from django.db.models.functions import Coalesce, TruncDay
 from django.utils import timezone
 from openpyxl import Workbook
 
 from apps.applications.models import JobApplication
 
+from .models import CloudBackupSettings, next_backup_due
+
+
+@dataclass(frozen=True)
+class PeriodCount:
+    start: date
+    count: int
+
 
 @dataclass(frozen=True)
 class Stats:
     total: int
     by_status: dict[str, int]
+    replied: int = 0
+    reply_rate: float | None = None
+    median_reply_time: timedelta | None = None
+    per_week: list[PeriodCount] = field(default_factory=list)
+    per_month: list[PeriodCount] = field(default_factory=list)
+
+    @property
+    def reply_rate_pct(self) -> float | None:
+        return None if self.reply_rate is None else self.reply_rate * 100
+
+    @property
+    def median_reply_days(self) -> float | None:
+        if self.median_reply_time is None:
+            return None
+        return self.median_reply_time.total_seconds() / 86400
+
+
+class PercentileCont(Aggregate):
+    """
+    percentile_cont(p) WITHIN GROUP (ORDER BY expr) - works for numbers and intervals.
+    """
+
+    function = "PERCENTILE_CONT"
+    template = "%(function)s(%(percentile)s) WITHIN GROUP (ORDER BY %(expressions)s)"
+
+    def __init__(self, expression, percentile: float, **extra):
+        super().__init__(expression, percentile=float(percentile), **extra)
 
 
 def build_stats(qs) -> Stats:
-    total = qs.count()
+    """
+    Two grouped queries, independent of row count on the Python side:
+
+    1. counts grouped by (status, date_trunc('day', applied_at)) - status totals,
+       reply counts and the weekly/monthly series are rolled up from these groups;
+    2. median time-to-reply, only when there is at least one reply.
+    """
+    groups = (
+        qs.order_by()
+        .annotate(day=TruncDay("applied_at"))
+        .values("status", "day")
+        .annotate(
+            n=Count("id"),
+            replied=Count("id", filter=Q(recruiter_reply_at__isnull=False)),
+        )
+    )
+
+    total = 0
+    replied = 0
     by_status: dict[str, int] = {}
-    for obj in qs.only("status"):
-        by_status[obj.status] = by_status.get(obj.status, 0) + 1
-    return Stats(total=total, by_status=by_status)
+    weeks: dict[date, int] = {}
+    months: dict[date, int] = {}
+
+    for g in groups:
+        n = g["n"]
+        total += n
+        replied += g["replied"]
+        by_status[g["status"]] = by_status.get(g["status"], 0) + n
+
+        day = timezone.localtime(g["day"]).date()
+        week = day - timedelta(days=day.weekday())
+        month = day.replace(day=1)
+        weeks[week] = weeks.get(week, 0) + n
+        months[month] = months.get(month, 0) + n
+
+    median = None
+    if replied:
+        reply_delay = ExpressionWrapper(
+            F("recruiter_reply_at") - F("applied_at"), output_field=DurationField()
+        )
+        median = (
+            qs.order_by()
+            .filter(recruiter_reply_at__isnull=False)
+            .aggregate(
+                median=PercentileCont(reply_delay, 0.5, output_field=DurationField())
+            )["median"]
+        )
+
+    return Stats(
+        total=total,
+        by_status=dict(sorted(by_status.items(), key=lambda kv: -kv[1])),
+        replied=replied,
+        reply_rate=(replied / total) if total else None,
+        median_reply_time=median,
+        per_week=[PeriodCount(start=k, count=v) for k, v in sorted(weeks.items())],
+        per_month=[PeriodCount(start=k, count=v) for k, v in sorted(months.items())],
+    )
+
+
+EXPORT_FIELDS = (
+    "id",
+    "title",
+    "company",
+    "location",
+    "source",
+    "status",
+    "applied_at",
+    "recruiter_reply_at",
+    "notes",
+)
+DELETED_FIELD = "deleted"  # delta backups only
+EXPORT_CHUNK_SIZE = 2000  # rows fetched per server-side cursor round trip
+STREAM_BUFFER_SIZE = 64 * 1024  # bytes yielded per chunk
+SPOOL_MAX_MEMORY = 1024 * 1024  # spill exports bigger than this to a temp file
+GZIP_LEVEL = 6
+GZIP_MAGIC = b"\x1f\x8b"
+_GZIP_WBITS = 16 + zlib.MAX_WBITS  # gzip header/trailer, same format as the `gzip` module
+
+
+class _Echo:
+    """
+    Pseudo-buffer for csv.writer: writerow() returns the formatted line instead of storing it.
+    """
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _export_rows(qs, chunk_size: int = EXPORT_CHUNK_SIZE):
+    for row in qs.values_list(*EXPORT_FIELDS).iterator(chunk_size=chunk_size):
+        yield [
+            v.isoformat() if isinstance(v, datetime) else ("" if v is None else v)
+            for v in row
+        ]
+
+
+def _delta_rows(qs, deleted_ids: Iterable[int], chunk_size: int):
+    for row in _export_rows(qs, chunk_size=chunk_size):
+        yield [*row, ""]
+    blank = [""] * (len(EXPORT_FIELDS) - 1)
+    for application_id in deleted_ids:
+        yield [application_id, *blank, "1"]
+
+
+def iter_csv(
+    qs, chunk_size: int = EXPORT_CHUNK_SIZE, *, deleted_ids: Iterable[int] | None = None
+) -> Iterator[bytes]:
+    """
+    Streams the export as UTF-8 CSV chunks of ~STREAM_BUFFER_SIZE bytes.
+
+    Rows come from a server-side cursor (`.iterator()`), so memory stays flat
+    regardless of how many applications the user has.
+
+    With `deleted_ids` this writes a delta backup: an extra `deleted` column,
+    and an id-only row with deleted=1 (a tombstone) for every id.
+    """
+    w = csv.writer(_Echo())
+    if deleted_ids is None:
+        header, rows = EXPORT_FIELDS, _export_rows(qs, chunk_size=chunk_size)
+    else:
+        header, rows = (*EXPORT_FIELDS, DELETED_FIELD), _delta_rows(qs, deleted_ids, chunk_size)
+    buf = [w.writerow(header)]
+    size = len(buf[0])
+
+    for row in rows:
+        line = w.writerow(row)
+        buf.append(line)
+        size += len(line)
+        if size >= STREAM_BUFFER_SIZE:
+            yield "".join(buf).encode("utf-8")
+            buf, size = [], 0
+
+    if buf:
+        yield "".join(buf).encode("utf-8")
 
 
 def export_csv(qs) -> bytes:
-    buf = io.StringIO()
-    w = csv.writer(buf)
-    w.writerow(["id", "title", "company", "location", "source", "status", "applied_at", "recruiter_reply_at", "notes"])
-    for a in qs:
-        w.writerow(
-            [
-                a.id,
-                a.title,
-                a.company,
-                a.location,
-                a.source,
-                a.status,
-                a.applied_at.isoformat() if a.applied_at else "",
-                a.recruiter_reply_at.isoformat() if a.recruiter_reply_at else "",
-                a.notes,
-            ]
+    return b"".join(iter_csv(qs))
+
+
+def export_fingerprint(qs, *extra) -> str:
+    """
+    Cheap change detector for backups: one aggregate query instead of an export.
+
+    Inserts and deletes move the count (or max id), edits move max(updated_at);
+    `extra` folds in anything else that changes the output, e.g. the file format.
+    """
+    agg = qs.aggregate(n=Count("id"), max_id=Max("id"), max_updated=Max("updated_at"))
+    max_updated = agg["max_updated"].isoformat() if agg["max_updated"] else ""
+    raw = ":".join(str(v) for v in (agg["n"], agg["max_id"], max_updated, *extra))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def mark_backup_dirty(user_id: int, now: datetime | None = None, *, full: bool = False) -> None:
+    """
+    Records a change to the user's backed-up data: `changed_at` moves on every
+    call, `dirty_since` keeps the first change not yet in a backup. The backup
+    worker picks the user up once the changes settle (see run_backup_worker).
+
+    `full=True` is for changes a delta can't express (rows moved between users,
+    deletions that left no tombstone): the next backup is a full snapshot.
+
+    One UPDATE, a no-op for users without backup settings.
+    """
+    now = now or timezone.now()
+    dirty_since = Coalesce(F("dirty_since"), Value(now))
+    fields = {
+        "changed_at": now,
+        "dirty_since": dirty_since,
+        "next_due_at": next_backup_due(dirty_since=dirty_since, changed_at=Value(now)),
+    }
+    if full:
+        fields["backup_watermark"] = None
+    CloudBackupSettings.objects.filter(user_id=user_id).update(**fields)
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = GZIP_LEVEL) -> Iterator[bytes]:
+    """
+    Compresses a byte stream into a .gz file on the fly, e.g. `gzip_chunks(iter_csv(qs))`.
+    """
+    z = zlib.compressobj(level, zlib.DEFLATED, _GZIP_WBITS)
+    for chunk in chunks:
+        out = z.compress(chunk)
+        if out:
+            yield out
+    yield z.flush()
+
+
+def spool_export(chunks: Iterable[bytes], max_memory: int = SPOOL_MAX_MEMORY):
+    """
+    Drains an export stream into a SpooledTemporaryFile and rewinds it.
+
+    Lets the DB cursor close before a slow upload starts, while keeping large
+    exports on disk instead of in worker memory. Caller owns (and closes) the file.
+    """
+    fh = tempfile.SpooledTemporaryFile(max_size=max_memory, mode="w+b")
+    try:
+        for chunk in chunks:
+            fh.write(chunk)
+        fh.seek(0)
+    except Exception:
+        fh.close()
+        raise
+    return fh
+
+
+def _xlsx_value(v):
+    # Excel has no timezone support: write local wall-clock time as a real datetime cell.
+    if isinstance(v, datetime):
+        return timezone.localtime(v).replace(tzinfo=None)
+    return v
+
+
+def write_xlsx(qs, fh, chunk_size: int = EXPORT_CHUNK_SIZE) -> None:
+    """
+    Writes the export into `fh` with a write-only workbook: rows are serialised
+    as they are appended, so no cell model is kept in memory.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("applications")
+    ws.append(list(EXPORT_FIELDS))
+    for row in qs.values_list(*EXPORT_FIELDS).iterator(chunk_size=chunk_size):
+        ws.append([_xlsx_value(v) for v in row])
+    wb.save(fh)
+
+
+def export_xlsx(qs, max_memory: int = SPOOL_MAX_MEMORY):
+    """
+    Returns a rewound SpooledTemporaryFile with the XLSX export. Caller closes it.
+    """
+    fh = tempfile.SpooledTemporaryFile(max_size=max_memory, mode="w+b")
+    try:
+        write_xlsx(qs, fh)
+        fh.seek(0)
+    except Exception:
+        fh.close()
+        raise
+    return fh
+
+
+IMPORT_BATCH_SIZE = 500
+IMPORT_FIELDS = [
+    "title",
+    "company",
+    "location",
+    "source",
+    "status",
+    "applied_at",
+    "recruiter_reply_at",
+    "notes",
+]
+
+
+def _batched(iterable: Iterable, size: int) -> Iterator[list]:
+    it = iter(iterable)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def _row_payload(row: dict) -> dict:
+    applied_at = _parse_date(row.get("applied_at"))
+    reply_at = _parse_date(row.get("recruiter_reply_at"))
+    return {
+        "title": (row.get("title") or "").strip(),
+        "company": (row.get("company") or "").strip(),
+        "location": (row.get("location") or "").strip(),
+        "source": (row.get("source") or "").strip(),
+        "status": (row.get("status") or "applied").strip(),
+        "applied_at": applied_at or timezone.now().date(),
+        "recruiter_reply_at": reply_at,
+        "notes": row.get("notes") or "",
+    }
+
+
+def _apply_batch(
+    user, rows: list[dict], id_map: dict[int, int] | None = None
+) -> tuple[int, int, int]:
+    """
+    Upserts one batch: a single id lookup, then one bulk_create and one bulk_update.
+    Tombstone rows (deleted=1, from delta backups) delete the application instead.
+
+    `id_map` translates ids from the file to ids in the database and learns the
+    new id of every created row, so later files of a delta chain that refer to
+    that row update it instead of creating a copy.
+    """
+    id_map = {} if id_map is None else id_map
+    parsed: list[tuple[int | None, dict]] = []
+    for row in rows:
+        raw_id = (row.get("id") or "").strip()
+        parsed.append((int(raw_id) if raw_id.isdigit() else None, row))
+
+    wanted_ids = {id_map.get(src, src) for src, _ in parsed if src is not None}
+    existing_ids = set(
+        JobApplication.objects.filter(user=user, id__in=wanted_ids).values_list("id", flat=True)
+    ) if wanted_ids else set()
+
+    now = timezone.now()
+    to_create: list[tuple[int | None, JobApplication]] = []
+    to_update: dict[int, JobApplication] = {}
+    to_delete: set[int] = set()
+    updated = 0
+
+    for src, row in parsed:
+        target = id_map.get(src, src) if src is not None else None
+        if (row.get(DELETED_FIELD) or "").strip() == "1":
+            if target in existing_ids:
+                to_delete.add(target)
+            continue
+        payload = _row_payload(row)
+        if target in existing_ids:
+            # bulk_update skips auto_now, so stamp updated_at ourselves
+            to_update[target] = JobApplication(id=target, user=user, updated_at=now, **payload)
+            updated += 1
+        else:
+            to_create.append((src, JobApplication(user=user, **payload)))
+
+    if to_create:
+        JobApplication.objects.bulk_create(
+            [obj for _, obj in to_create], batch_size=IMPORT_BATCH_SIZE
+        )
+        id_map.update((src, obj.pk) for src, obj in to_create if src is not None)
+    if to_update:
+        JobApplication.objects.bulk_update(
+            list(to_update.values()),
+            fields=IMPORT_FIELDS + ["updated_at"],
+            batch_size=IMPORT_BATCH_SIZE,
         )
-    return buf.getvalue().encode("utf-8")
-
-
-def export_xlsx(qs) -> bytes:
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "applications"
-    ws.append(["id", "title", "company", "location", "source", "status", "applied_at", "recruiter_reply_at", "notes"])
-    for a in qs:
-        ws.append(
-            [
-                a.id,
-                a.title,
-                a.company,
-                a.location,
-                a.source,
-                a.status,
-                a.applied_at.isoformat() if a.applied_at else "",
-                a.recruiter_reply_at.isoformat() if a.recruiter_reply_at else "",
-                a.notes,
-            ]
+    deleted = 0
+    if to_delete:
+        deleted = JobApplication.objects.filter(user=user, id__in=to_delete).delete()[1].get(
+            JobApplication._meta.label, 0
         )
-    out = io.BytesIO()
-    wb.save(out)
-    return out.getvalue()
+    return len(to_create), updated, deleted
+
+
+class ImportLimitError(ValueError):
+    pass
+
+
+class ImportFormatError(ValueError):
+    pass
 
 
-def import_csv(user, raw_bytes: bytes) -> dict[str, int]:
+READ_CHUNK_SIZE = 64 * 1024
+MAX_LINE_CHARS = 1024 * 1024
+
+
+def _iter_byte_chunks(source, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Accepts bytes, a Django UploadedFile, any binary file object, or an iterable of byte chunks.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        yield bytes(source)
+    elif hasattr(source, "chunks"):
+        yield from source.chunks(chunk_size)
+    elif hasattr(source, "read"):
+        while chunk := source.read(chunk_size):
+            yield chunk
+    else:
+        yield from source
+
+
+def _gunzip_if_compressed(
+    chunks: Iterable[bytes], chunk_size: int = READ_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Passes plain bytes through and transparently decompresses gzip input (detected by
+    its magic bytes, whatever the file name says). Output comes in pieces of at most
+    `chunk_size`, so a small, highly compressed file can't blow up memory; the import
+    byte limit applies to the decompressed size.
+    """
+    it = iter(chunks)
+    head = b""
+    for chunk in it:
+        head += chunk
+        if len(head) >= len(GZIP_MAGIC):
+            break
+
+    if not head.startswith(GZIP_MAGIC):
+        if head:
+            yield head
+        yield from it
+        return
+
+    d = zlib.decompressobj(_GZIP_WBITS)
+    started = False  # d has been fed part of a member
+    for chunk in chain([head], it):
+        while chunk:
+            started = True
+            out = d.decompress(chunk, chunk_size)
+            if out:
+                yield out
+            if d.eof:
+                # Concatenated members (`cat a.gz b.gz`) are valid gzip too.
+                chunk = d.unused_data
+                d = zlib.decompressobj(_GZIP_WBITS)
+                started = False
+            else:
+                chunk = d.unconsumed_tail
+    out = d.flush()
+    if out:
+        yield out
+    if started and not d.eof:
+        # A cut-off download or upload: fail rather than import the rows read so far.
+        raise ImportFormatError("The file is incomplete (truncated gzip stream).")
+
+
+def _iter_source_chunks(source) -> Iterator[bytes]:
+    return _gunzip_if_compressed(_iter_byte_chunks(source))
+
+
+def _iter_lines(chunks: Iterable[bytes], max_bytes: int) -> Iterator[str]:
+    """
+    Incrementally decodes UTF-8 chunks into newline-terminated lines for csv.reader.
+    Only the current partial line is buffered between chunks.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    seen = 0
+
+    for chunk in chunks:
+        seen += len(chunk)
+        if seen > max_bytes:
+            raise ImportLimitError(f"File is too large (limit {max_bytes // (1024 * 1024)} MB).")
+
+        *lines, pending = (pending + decoder.decode(chunk)).split("\n")
+        for line in lines:
+            yield line + "\n"
+        if len(pending) > MAX_LINE_CHARS:
+            raise ImportLimitError("File contains a line that is too long.")
+
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def count_csv_rows(source, max_bytes: int | None = None) -> int:
+    """
+    Cheap pre-pass (no DB) used to report import progress as done/total.
+    """
+    max_bytes = settings.IMPORT_MAX_BYTES if max_bytes is None else max_bytes
+    reader = csv.reader(_iter_lines(_iter_source_chunks(source), max_bytes))
+    next(reader, None)  # header
+    return sum(1 for _ in reader)
+
+
+def import_csv(
+    user,
+    source,
+    *,
+    max_rows: int | None = None,
+    max_bytes: int | None = None,
+    on_progress: Callable[[int, int], None] | None = None,
+    id_map: dict[int, int] | None = None,
+) -> dict:
     """
     Imports CSV with header:
     id,title,company,location,source,status,applied_at,recruiter_reply_at,notes
 
     Dedupe rule (per TZ): if id exists -> update; else -> create.
+    Delta backups add a `deleted` column; rows with deleted=1 delete that id.
+
+    `source` is bytes, a file object, an UploadedFile or an iterable of byte chunks,
+    plain or gzip-compressed (.csv.gz); it is decoded and parsed incrementally.
+    Rows are applied in batches of IMPORT_BATCH_SIZE (one lookup + bulk writes
+    each), all inside one transaction: a failed or over-limit import leaves the
+    account untouched.
+
+    `on_progress(created, updated)` is called after every batch. Pass the same
+    `id_map` dict when replaying several files in a row (see _apply_batch).
     """
-    created = 0
-    updated = 0
+    max_rows = settings.IMPORT_MAX_ROWS if max_rows is None else max_rows
+    max_bytes = settings.IMPORT_MAX_BYTES if max_bytes is None else max_bytes
 
-    text = raw_bytes.decode("utf-8", errors="replace")
-    reader = csv.DictReader(io.StringIO(text))
+    started = time.monotonic()
+    rows = created = updated = deleted = 0
 
-    for row in reader:
-        raw_id = (row.get("id") or "").strip()
-        obj = None
-        if raw_id.isdigit():
-            obj = JobApplication.objects.filter(user=user, id=int(raw_id)).first()
-
-        applied_at = _parse_date(row.get("applied_at"))
-        reply_at = _parse_date(row.get("recruiter_reply_at"))
-
-        payload = {
-            "title": (row.get("title") or "").strip(),
-            "company": (row.get("company") or "").strip(),
-            "location": (row.get("location") or "").strip(),
-            "source": (row.get("source") or "").strip(),
-            "status": (row.get("status") or "applied").strip(),
-            "applied_at": applied_at or timezone.now().date(),
-            "recruiter_reply_at": reply_at,
-            "notes": row.get("notes") or "",
-        }
-
-        if obj:
-            for k, v in payload.items():
-                setattr(obj, k, v)
-            obj.save()
-            updated += 1
-        else:
-            JobApplication.objects.create(user=user, **payload)
-            created += 1
+    reader = csv.DictReader(_iter_lines(_iter_source_chunks(source), max_bytes))
+
+    with transaction.atomic():
+        for batch in _batched(reader, IMPORT_BATCH_SIZE):
+            rows += len(batch)
+            if rows > max_rows:
+                raise ImportLimitError(f"Too many rows (limit {max_rows}).")
+            c, u, d = _apply_batch(user, batch, id_map)
+            created += c
+            updated += u
+            deleted += d
+            if on_progress:
+                on_progress(created, updated)
+        # bulk writes send no model signals (deletes do, through the collector)
+        if created or updated:
+            mark_backup_dirty(user.id)
 
-    return {"created": created, "updated": updated}
+    return {
+        "created": created,
+        "updated": updated,
+        "deleted": deleted,
+        "seconds": round(time.monotonic() - started, 3),
+    }
 
 
 def _parse_date(value: str | None):
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.applications.models import JobApplication
+
+from .models import BackupTombstone, CloudBackupSettings
+from .services import mark_backup_dirty
+
+
+# Bulk paths (import_csv, queryset.update) call mark_backup_dirty themselves.
+
+
+@receiver(post_save, sender=JobApplication)
+def mark_backup_dirty_on_save(sender, instance: JobApplication, raw: bool = False, **kwargs):
+    if raw:
+        return
+    mark_backup_dirty(instance.user_id)
+
+
+@receiver(post_delete, sender=JobApplication)
+def mark_backup_dirty_on_delete(sender, instance: JobApplication, origin=None, **kwargs):
+    # Cascades from deleting the user need neither a tombstone nor a backup.
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin is not None and origin_model is not JobApplication:
+        return
+
+    now = timezone.now()
+    mark_backup_dirty(instance.user_id, now)
+    if settings.DRIVE_BACKUP_DELTAS and CloudBackupSettings.objects.filter(
+        user_id=instance.user_id, enabled=True
+    ).exists():
+        BackupTombstone.objects.create(
+            user_id=instance.user_id, application_id=instance.pk, deleted_at=now
+        )
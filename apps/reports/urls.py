@@ -8,6 +8,7 @@ urlpatterns = [
     path("statistics/", views.statistics, name="statistics"),
     path("export/<str:fmt>/", views.export_report, name="export"),
     path("import/", views.import_view, name="import"),
+    path("import/jobs/<int:pk>/", views.import_job_status, name="import_job_status"),
 
     path("drive/", views.drive_backups, name="drive_backups"),
     path("drive/export/<str:fmt>/", views.drive_export, name="drive_export"),
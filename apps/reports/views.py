@@ -2,32 +2,39 @@ from __future__ import annotations
 
 import logging
 
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.http import HttpResponse, HttpResponseRedirect
+from django.http import FileResponse, HttpResponseRedirect, JsonResponse, StreamingHttpResponse
 from django.shortcuts import redirect, render
 from django.urls import reverse
 from django.utils import timezone
 from django.views.decorators.http import require_POST
 
-from allauth.socialaccount.models import SocialAccount
-
 from apps.applications.models import JobApplication
 
 from .drive import (
     DriveError,
     disconnect_drive,
-    download_file,
     ensure_jobapply_folder,
     get_drive_status,
-    list_backups,
+    list_backups_page,
     upload_backup,
 )
-from .models import CloudBackupSettings
-from .services import build_stats, export_csv, export_xlsx, import_csv
+from .models import CloudBackupSettings, ImportJob, ImportJobSource, ImportJobStatus
+from .services import (
+    build_stats,
+    export_xlsx,
+    gzip_chunks,
+    iter_csv,
+    mark_backup_dirty,
+    spool_export,
+)
 
 logger = logging.getLogger(__name__)
 
+BACKUPS_PAGE_SIZE = 30
+
 
 @login_required
 def statistics(request):
@@ -47,19 +54,17 @@ def export_report(request, fmt: str):
 
     try:
         if fmt == "csv":
-            content = export_csv(qs)
-            resp = HttpResponse(content, content_type="text/csv; charset=utf-8")
+            resp = StreamingHttpResponse(iter_csv(qs), content_type="text/csv; charset=utf-8")
             resp["Content-Disposition"] = 'attachment; filename="jobapply_export.csv"'
             return resp
 
         if fmt == "xlsx":
-            content = export_xlsx(qs)
-            resp = HttpResponse(
-                content,
+            return FileResponse(
+                export_xlsx(qs),
+                as_attachment=True,
+                filename="jobapply_export.xlsx",
                 content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             )
-            resp["Content-Disposition"] = 'attachment; filename="jobapply_export.xlsx"'
-            return resp
 
         return redirect("reports:statistics")
     except Exception:
@@ -68,6 +73,24 @@ def export_report(request, fmt: str):
         return redirect("reports:statistics")
 
 
+def _active_import_job(user) -> ImportJob | None:
+    return (
+        ImportJob.objects.filter(
+            user=user, status__in=[ImportJobStatus.QUEUED, ImportJobStatus.RUNNING]
+        )
+        .order_by("-created_at")
+        .first()
+    )
+
+
+def _import_page_context(request) -> dict:
+    job = None
+    job_id = (request.GET.get("job") or "").strip()
+    if job_id.isdigit():
+        job = ImportJob.objects.filter(user=request.user, pk=int(job_id)).first()
+    return {"job": job or _active_import_job(request.user)}
+
+
 @login_required
 def import_view(request):
     if request.method == "POST":
@@ -75,15 +98,42 @@ def import_view(request):
         if not f:
             return render(request, "reports/import.html", {"error": "No file uploaded."})
 
+        if f.size and f.size > settings.IMPORT_MAX_BYTES:
+            limit_mb = settings.IMPORT_MAX_BYTES // (1024 * 1024)
+            error = f"File is too large (limit {limit_mb} MB)."
+            return render(request, "reports/import.html", {"error": error})
+
+        if _active_import_job(request.user):
+            return render(
+                request,
+                "reports/import.html",
+                {
+                    "error": "An import is already in progress. Wait for it to finish.",
+                    **_import_page_context(request),
+                },
+            )
+
         try:
-            raw = f.read()
-            result = import_csv(request.user, raw)
-            return render(request, "reports/import.html", {"result": result})
+            job = ImportJob.objects.create(
+                user=request.user,
+                source=ImportJobSource.UPLOAD,
+                file=f,
+                filename=getattr(f, "name", "")[:255],
+            )
+            return redirect(f"{reverse('reports:import')}?job={job.id}")
         except Exception:
             logger.exception("import_view failed user=%s filename=%s", request.user.id, getattr(f, "name", ""))
             return render(request, "reports/import.html", {"error": "Import failed. Check the file format and try again."})
 
-    return render(request, "reports/import.html")
+    return render(request, "reports/import.html", _import_page_context(request))
+
+
+@login_required
+def import_job_status(request, pk: int):
+    job = ImportJob.objects.filter(user=request.user, pk=pk).first()
+    if not job:
+        return JsonResponse({"error": "Not found"}, status=404)
+    return JsonResponse(job.as_progress())
 
 
 @login_required
@@ -96,28 +146,27 @@ def drive_backups(request):
         logger.exception("CloudBackupSettings get_or_create failed user=%s", request.user.id)
         settings_obj = CloudBackupSettings(user=request.user, enabled=False)
 
-    google_email = None
+    google_email = request.user.email or drive_status.get("email")
     folder_url = None
 
-    try:
-        acc = SocialAccount.objects.filter(user=request.user, provider="google").first()
-        if acc:
-            google_email = (request.user.email or "") or (acc.extra_data.get("email") if acc.extra_data else None)
-    except Exception:
-        logger.exception("drive_backups google_email resolve failed user=%s", request.user.id)
-
     backups: list = []
+    next_page_token = None
+    page_token = request.GET.get("page") or None
     error = None
 
     if drive_status.get("connected") and drive_status.get("has_refresh_token"):
         try:
-            folder_id = ensure_jobapply_folder(
+            page = list_backups_page(
                 request.user,
-                root_name="JobApply",
-                subfolder="backups",
+                page_size=BACKUPS_PAGE_SIZE,
+                page_token=page_token,
+                backup_settings=settings_obj,
+            )
+            backups, next_page_token = page.files, page.next_page_token
+            folder_id = settings_obj.drive_backups_folder_id or ensure_jobapply_folder(
+                request.user, backup_settings=settings_obj
             )
             folder_url = f"https://drive.google.com/drive/folders/{folder_id}"
-            backups = list_backups(request.user, limit=30, root_name="JobApply", subfolder="backups")
         except DriveError as e:
             logger.exception("drive_backups DriveError user=%s code=%s", request.user.id, getattr(e, "code", ""))
             error = str(e)
@@ -133,34 +182,43 @@ def drive_backups(request):
             "google_email": google_email,
             "folder_url": folder_url,
             "backups": backups,
+            "next_page_token": next_page_token,
+            "is_first_page": page_token is None,
             "error": error,
             "auto_backup_enabled": bool(getattr(settings_obj, "enabled", False)),
+            "backup_keep": settings_obj.keep,
+            "backup_interval_minutes": int(settings_obj.interval.total_seconds() // 60),
         },
     )
 
 
 @login_required
 def drive_export(request, fmt: str):
-    if fmt != "csv":
+    if fmt not in ("csv", "csv.gz"):
         return redirect("reports:drive_backups")
 
     qs = JobApplication.objects.filter(user=request.user).order_by("-applied_at")
     ts = timezone.now().strftime("%d-%m-%Y-%H-%M")
 
     try:
-        content = export_csv(qs)
-        filename = f"manual_backup-{ts}.csv"
-
-        upload_backup(
-            request.user,
-            filename,
-            content,
-            "text/csv",
-            root_name="JobApply",
-            subfolder="backups",
-        )
+        filename = f"manual_backup-{ts}.{fmt}"
+        chunks = iter_csv(qs)
+        mime_type = "text/csv"
+        if fmt == "csv.gz":
+            chunks = gzip_chunks(chunks)
+            mime_type = "application/gzip"
+
+        with spool_export(chunks) as content:
+            upload_backup(
+                request.user,
+                filename,
+                content,
+                mime_type,
+                root_name="JobApply",
+                subfolder="backups",
+            )
 
-        messages.success(request, "Backup uploaded to Google Drive (CSV).")
+        messages.success(request, f"Backup uploaded to Google Drive ({fmt.upper()}).")
         return redirect("reports:drive_backups")
 
     except DriveError as e:
@@ -175,15 +233,19 @@ def drive_export(request, fmt: str):
 
 @login_required
 def drive_restore(request, file_id: str):
+    if _active_import_job(request.user):
+        messages.error(request, "An import is already in progress. Wait for it to finish.")
+        return redirect("reports:import")
+
     try:
-        raw = download_file(request.user, file_id)
-        result = import_csv(request.user, raw)
-        messages.success(request, "Restore completed.")
-        return render(request, "reports/import.html", {"result": result})
-    except DriveError as e:
-        logger.exception("drive_restore DriveError user=%s code=%s file_id=%s", request.user.id, getattr(e, "code", ""), file_id)
-        messages.error(request, str(e))
-        return redirect("reports:drive_backups")
+        job = ImportJob.objects.create(
+            user=request.user,
+            source=ImportJobSource.DRIVE,
+            drive_file_id=file_id,
+            filename=(request.GET.get("name") or "")[:255],
+        )
+        messages.success(request, "Restore queued.")
+        return redirect(f"{reverse('reports:import')}?job={job.id}")
     except Exception:
         logger.exception("drive_restore failed user=%s file_id=%s", request.user.id, file_id)
         messages.error(request, "Restore failed. Check the backup file and try again.")
@@ -225,13 +287,17 @@ def toggle_auto_backup(request):
         settings_obj, _ = CloudBackupSettings.objects.get_or_create(user=request.user)
         settings_obj.enabled = enabled
         settings_obj.save(update_fields=["enabled", "updated_at"])
+        if enabled:
+            # First backup shortly after enabling, not at the next edit. Deletions
+            # made while disabled left no tombstones, so it has to be a full one.
+            mark_backup_dirty(request.user.id, full=True)
     except Exception:
         logger.exception("toggle_auto_backup save failed user=%s enabled=%s", request.user.id, enabled)
         messages.error(request, "Could not update auto backup setting. Try again later.")
         return redirect("reports:drive_backups")
 
     if enabled:
-        messages.success(request, "Auto backups enabled (every 5 minutes).")
+        messages.success(request, "Auto backups enabled (a few minutes after each change).")
     else:
         messages.success(request, "Auto backups disabled.")
 
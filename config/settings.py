@@ -24,6 +24,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # Third party
     "allauth",
     "allauth.account",
@@ -35,7 +36,7 @@ INSTALLED_APPS = [
     "apps.accounts.apps.AccountsConfig",
     "apps.applications",
     "apps.interviews",
-    "apps.reports",
+    "apps.reports.apps.ReportsConfig",
 ]
 
 MIDDLEWARE = [
@@ -112,6 +113,10 @@ STATIC_URL = "static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 STATICFILES_DIRS = [p for p in [BASE_DIR / "static"] if p.exists()]
 
+# Queued import uploads (shared by web and import-worker containers)
+MEDIA_URL = "media/"
+MEDIA_ROOT = BASE_DIR / "media"
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 SITE_ID = 1
@@ -158,6 +163,44 @@ AUTHENTICATION_BACKENDS = (
     "allauth.account.auth_backends.AuthenticationBackend",
 )
 
+# CSV import limits (uploads and Drive restores)
+IMPORT_MAX_ROWS = int(getenv("IMPORT_MAX_ROWS", "50000"))
+IMPORT_MAX_BYTES = int(getenv("IMPORT_MAX_BYTES", str(20 * 1024 * 1024)))
+
+# Auto backups kept on Drive (autobackup_latest + autobackup-1..N-1); default for
+# users without their own retention, which is clamped to 1..DRIVE_BACKUP_KEEP_MAX
+DRIVE_BACKUP_KEEP_MAX = max(int(getenv("DRIVE_BACKUP_KEEP_MAX", "10")), 1)
+DRIVE_BACKUP_KEEP = min(max(int(getenv("DRIVE_BACKUP_KEEP", "3")), 1), DRIVE_BACKUP_KEEP_MAX)
+# Minimum time between auto backups of one user, in minutes; per-user overrides
+# are clamped to BACKUP_INTERVAL_MIN_MINUTES..BACKUP_INTERVAL_MAX_MINUTES
+BACKUP_INTERVAL_MIN_MINUTES = max(int(getenv("BACKUP_INTERVAL_MIN_MINUTES", "5")), 1)
+BACKUP_INTERVAL_MAX_MINUTES = max(
+    int(getenv("BACKUP_INTERVAL_MAX_MINUTES", "1440")), BACKUP_INTERVAL_MIN_MINUTES
+)
+BACKUP_INTERVAL_MINUTES = min(
+    max(int(getenv("BACKUP_INTERVAL_MINUTES", "5")), BACKUP_INTERVAL_MIN_MINUTES),
+    BACKUP_INTERVAL_MAX_MINUTES,
+)
+# Auto backups as .csv.gz (restore detects either format)
+DRIVE_BACKUP_GZIP = getenv("DRIVE_BACKUP_GZIP", "1") == "1"
+# Auto backups upload only changed rows (+ deletions) between full snapshots;
+# a full snapshot is taken every N deltas or when the last one is older than N hours
+DRIVE_BACKUP_DELTAS = getenv("DRIVE_BACKUP_DELTAS", "1") == "1"
+DRIVE_BACKUP_FULL_EVERY = int(getenv("DRIVE_BACKUP_FULL_EVERY", "24"))
+DRIVE_BACKUP_FULL_MAX_AGE_HOURS = int(getenv("DRIVE_BACKUP_FULL_MAX_AGE_HOURS", "24"))
+# Uploads above one chunk use a resumable session (rounded down to 256 KiB multiples)
+DRIVE_UPLOAD_CHUNK_SIZE = int(getenv("DRIVE_UPLOAD_CHUNK_SIZE", str(2 * 1024 * 1024)))
+# Per-process Drive request budget (token bucket), 0 disables throttling
+DRIVE_MAX_QPS = float(getenv("DRIVE_MAX_QPS", "10"))
+# Socket timeout for Drive HTTP calls, seconds
+DRIVE_HTTP_TIMEOUT = int(getenv("DRIVE_HTTP_TIMEOUT", "60"))
+# Backup worker: users backed up in parallel, and how long a tick waits for one user
+# (seconds, counted from when its backup starts)
+BACKUP_CONCURRENCY = max(int(getenv("BACKUP_CONCURRENCY", "4")), 1)
+BACKUP_USER_TIMEOUT = int(getenv("BACKUP_USER_TIMEOUT", "300"))
+# How long a claimed user stays with one worker without renewal (worker crash recovery)
+BACKUP_LEASE_SECONDS = int(getenv("BACKUP_LEASE_SECONDS", "600"))
+
 TURNSTILE_SITE_KEY = getenv("TURNSTILE_SITE_KEY", "")
 TURNSTILE_SECRET_KEY = getenv("TURNSTILE_SECRET_KEY", "")
 TURNSTILE_ENABLED = getenv("TURNSTILE_ENABLED", "1") == "1"
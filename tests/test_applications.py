@@ -0,0 +1,155 @@
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.accounts.models import UserProfile
+from apps.applications.models import JobApplication
+from apps.applications.pagination import (
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+    paginate_keyset,
+)
+
+
+@pytest.fixture
+def user(db, django_user_model):
+    u = django_user_model.objects.create_user(username="u1", email="u1@example.com", password="x")
+    UserProfile.objects.create(user=u, google_data_access_consent=True)
+    return u
+
+
+@pytest.fixture
+def apps_list(user):
+    base = timezone.now()
+    out = []
+    for i in range(7):
+        out.append(
+            JobApplication.objects.create(
+                user=user,
+                title=f"Job {i}",
+                company="ACME",
+                # two rows share every timestamp -> exercises the id tie-breaker
+                applied_at=base - timedelta(days=i // 2),
+            )
+        )
+    return out
+
+
+def _walk(qs, sort, page_size):
+    pages = []
+    cursor = None
+    while True:
+        page = paginate_keyset(qs, sort, cursor, page_size)
+        pages.append(page)
+        if not page.next_cursor:
+            return pages
+        cursor = page.next_cursor
+
+
+@pytest.mark.parametrize("sort", ["applied_at", "-applied_at", "updated_at", "-updated_at"])
+def test_keyset_walk_matches_full_ordering(user, apps_list, sort):
+    qs = JobApplication.objects.filter(user=user)
+    prefix = "-" if sort.startswith("-") else ""
+    expected = list(qs.order_by(sort, f"{prefix}id").values_list("id", flat=True))
+
+    pages = _walk(qs, sort, page_size=3)
+    seen = [a.id for p in pages for a in p.items]
+
+    assert seen == expected
+    assert [len(p.items) for p in pages] == [3, 3, 1]
+    assert pages[0].prev_cursor is None
+
+
+def test_keyset_prev_returns_previous_page(user, apps_list):
+    qs = JobApplication.objects.filter(user=user)
+    p1 = paginate_keyset(qs, "-applied_at", None, 3)
+    p2 = paginate_keyset(qs, "-applied_at", p1.next_cursor, 3)
+    back = paginate_keyset(qs, "-applied_at", p2.prev_cursor, 3)
+
+    assert [a.id for a in back.items] == [a.id for a in p1.items]
+    assert back.prev_cursor is None
+    assert back.next_cursor
+
+
+def test_cursor_is_bound_to_sort(user, apps_list):
+    qs = JobApplication.objects.filter(user=user)
+    p1 = paginate_keyset(qs, "-applied_at", None, 3)
+    with pytest.raises(InvalidCursor):
+        decode_cursor(p1.next_cursor, "updated_at")
+    with pytest.raises(InvalidCursor):
+        decode_cursor("not-a-cursor", "-applied_at")
+    with pytest.raises(InvalidCursor):
+        decode_cursor(encode_cursor("-applied_at", (1,), "next"), "-applied_at")
+
+
+def test_list_view_paginates_without_hard_cap(client, user, apps_list, monkeypatch):
+    import apps.applications.views as views_mod
+
+    monkeypatch.setattr(views_mod, "PAGE_SIZE", 5)
+    client.force_login(user)
+
+    url = reverse("applications:list")
+    r1 = client.get(url)
+    assert r1.status_code == 200
+    assert len(r1.context["items"]) == 5
+    assert r1.context["next_cursor"]
+
+    r2 = client.get(url, {"cursor": r1.context["next_cursor"]})
+    assert len(r2.context["items"]) == 2
+    assert r2.context["next_cursor"] is None
+
+    r3 = client.get(url, {"cursor": "garbage"})
+    assert len(r3.context["items"]) == 5
+
+
+@pytest.fixture
+def searchable(user):
+    rows = [
+        ("Backend Engineer", "Google", "Berlin", "", ""),
+        ("Frontend Developer", "Zalando", "Munich", "", "Referral from a Google recruiter"),
+        ("Data Analyst", "N26", "Berlin", "LinkedIn", ""),
+    ]
+    return [
+        JobApplication.objects.create(
+            user=user, title=t, company=c, location=loc, source=src, notes=notes
+        )
+        for t, c, loc, src, notes in rows
+    ]
+
+
+def test_search_matches_notes_and_source(user, searchable):
+    from apps.applications.search import search_applications
+
+    qs = JobApplication.objects.filter(user=user)
+    assert {a.title for a in search_applications(qs, "recruiter")} == {"Frontend Developer"}
+    assert {a.title for a in search_applications(qs, "linkedin")} == {"Data Analyst"}
+
+
+def test_search_tolerates_typos(user, searchable):
+    from apps.applications.search import search_applications
+
+    qs = JobApplication.objects.filter(user=user)
+    assert "Frontend Developer" in {a.title for a in search_applications(qs, "fronted")}
+    assert "Backend Engineer" in {a.title for a in search_applications(qs, "gogle")}
+
+
+def test_list_view_search_ranks_by_relevance(client, user, searchable, monkeypatch):
+    import apps.applications.views as views_mod
+
+    client.force_login(user)
+    r = client.get(reverse("applications:list"), {"q": "Google"})
+
+    assert r.context["sort"] == "relevance"
+    titles = [a.title for a in r.context["items"]]
+    # company hit (weight A) outranks a mention in the notes (weight D)
+    assert titles == ["Backend Engineer", "Frontend Developer"]
+
+    monkeypatch.setattr(views_mod, "PAGE_SIZE", 1)
+    p1 = client.get(reverse("applications:list"), {"q": "Google"})
+    p2 = client.get(
+        reverse("applications:list"), {"q": "Google", "cursor": p1.context["next_cursor"]}
+    )
+    assert [a.title for a in p1.context["items"] + p2.context["items"]] == titles
@@ -0,0 +1,485 @@
+import io
+import threading
+from datetime import timedelta
+
+import pytest
+from django.conf import settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.applications.models import JobApplication
+from apps.reports.management.commands import run_backup_worker
+from apps.reports.models import CloudBackupSettings, next_backup_due
+from apps.reports.services import export_fingerprint
+
+
+@pytest.fixture
+def enabled_user(db, django_user_model):
+    u = django_user_model.objects.create_user(username="u1", email="u1@example.com", password="x")
+    CloudBackupSettings.objects.create(user=u, enabled=True)
+    return u
+
+
+@pytest.fixture
+def uploads(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        run_backup_worker,
+        "get_drive_status",
+        lambda user: {"connected": True, "has_refresh_token": True},
+    )
+    monkeypatch.setattr(
+        run_backup_worker, "upload_backup_rotate", lambda **kw: calls.append(kw["user"].id)
+    )
+    monkeypatch.setattr(
+        run_backup_worker, "upload_backup_delta", lambda **kw: calls.append(kw["user"].id)
+    )
+    return calls
+
+
+@pytest.fixture
+def uploaded_files(uploads, monkeypatch, settings):
+    settings.DRIVE_BACKUP_GZIP = False
+    files = []
+
+    def _record(kind):
+        return lambda **kw: files.append((kind, kw["content_bytes"].read().decode()))
+
+    monkeypatch.setattr(run_backup_worker, "upload_backup_rotate", _record("full"))
+    monkeypatch.setattr(run_backup_worker, "upload_backup_delta", _record("delta"))
+    return files
+
+
+def _tick(concurrency=1):
+    # Pool threads open their own DB connection and can't see rows inside the
+    # test transaction, so only the transactional test below uses the pool.
+    cmd = run_backup_worker.Command(stdout=io.StringIO(), stderr=io.StringIO())
+    cmd._concurrency = concurrency
+    cmd._tick()
+    return cmd.stdout.getvalue()
+
+
+def _make_due(user):
+    CloudBackupSettings.objects.filter(user=user).update(last_run_at=None, next_due_at=None)
+
+
+def test_unchanged_account_is_not_uploaded_again(
+    enabled_user, uploads, django_assert_max_num_queries
+):
+    app = JobApplication.objects.create(user=enabled_user, title="Dev", company="ACME")
+
+    _tick()
+    assert uploads == [enabled_user.id]
+
+    _make_due(enabled_user)
+    # claim (savepoint, select, lease, release), the fingerprint aggregate,
+    # then moving last_run_at
+    with django_assert_max_num_queries(6):
+        out = _tick()
+    assert "no changes" in out
+    assert uploads == [enabled_user.id]
+
+    app.title = "Senior Dev"
+    app.save()
+    _make_due(enabled_user)
+    _tick()
+    assert uploads == [enabled_user.id, enabled_user.id]
+
+
+def test_fingerprint_tracks_inserts_deletes_and_edits(enabled_user):
+    qs = JobApplication.objects.filter(user=enabled_user)
+    empty = export_fingerprint(qs, "csv")
+    a = JobApplication.objects.create(user=enabled_user, title="A", company="c")
+    one = export_fingerprint(qs, "csv")
+    assert one != empty
+    assert export_fingerprint(qs, "csv.gz") != one
+
+    a.status = "offer"
+    a.save(update_fields=["status", "updated_at"])
+    edited = export_fingerprint(qs, "csv")
+    assert edited != one
+
+    a.delete()
+    assert export_fingerprint(qs, "csv") == empty
+
+
+@pytest.mark.django_db(transaction=True)
+def test_due_users_are_backed_up_in_parallel(django_user_model, monkeypatch):
+    users = [
+        django_user_model.objects.create_user(username=f"u{i}", password="x") for i in range(2)
+    ]
+    for u in users:
+        CloudBackupSettings.objects.create(user=u, enabled=True)
+        JobApplication.objects.create(user=u, title="Dev", company="ACME")
+
+    # Both uploads must be in flight at once to get past the barrier.
+    barrier = threading.Barrier(2, timeout=10)
+    uploaded = []
+
+    def upload(**kw):
+        barrier.wait()
+        uploaded.append(kw["user"].id)
+
+    monkeypatch.setattr(
+        run_backup_worker,
+        "get_drive_status",
+        lambda user: {"connected": True, "has_refresh_token": True},
+    )
+    monkeypatch.setattr(run_backup_worker, "upload_backup_rotate", upload)
+
+    out = _tick(concurrency=2)
+
+    assert sorted(uploaded) == sorted(u.id for u in users), out
+    assert not CloudBackupSettings.objects.filter(last_run_at__isnull=True).exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_ticks_claim_free_slots_only_and_time_users_from_their_start(
+    django_user_model, monkeypatch, settings
+):
+    settings.BACKUP_USER_TIMEOUT = 0.5
+    users = [
+        django_user_model.objects.create_user(username=f"u{i}", password="x") for i in range(4)
+    ]
+    for u in users:
+        CloudBackupSettings.objects.create(user=u, enabled=True)
+        JobApplication.objects.create(user=u, title="Dev", company="ACME")
+
+    release = threading.Event()
+    stuck, uploaded = users[0].id, []
+
+    def upload(**kw):
+        if kw["user"].id == stuck:
+            release.wait(timeout=10)
+        uploaded.append(kw["user"].id)
+
+    monkeypatch.setattr(
+        run_backup_worker,
+        "get_drive_status",
+        lambda user: {"connected": True, "has_refresh_token": True},
+    )
+    monkeypatch.setattr(run_backup_worker, "upload_backup_rotate", upload)
+
+    cmd = run_backup_worker.Command(stdout=io.StringIO(), stderr=io.StringIO())
+    cmd._concurrency = 2
+    try:
+        # Two slots: users 0 and 1 start, 2 and 3 stay unclaimed (and unleased).
+        assert cmd._tick() is True
+        assert uploaded == [users[1].id]
+        assert cmd.stderr.getvalue().count("still running") == 1
+        assert f"user={stuck} still running" in cmd.stderr.getvalue()
+        assert CloudBackupSettings.objects.filter(leased_until__isnull=False).count() == 1
+
+        # The stuck user still holds a thread: one slot left.
+        assert [r.user_id for r in cmd._claim_due_rows(timezone.now(), cmd._free_slots())] == [
+            users[2].id
+        ]
+    finally:
+        release.set()
+        cmd._pool.shutdown(wait=True)
+
+
+def test_only_due_rows_are_selected_and_sleep_follows_next_due(django_user_model, db, monkeypatch):
+    now = timezone.now()
+    hour_ago = now - timedelta(hours=1)
+    s = timedelta(seconds=1)
+    rows = {
+        # name: (last_run_at, dirty_since, changed_at)
+        "never": (None, None, None),
+        "stale": (now - timedelta(days=2), None, None),  # daily re-check
+        "quiet": (hour_ago, now - 180 * s, now - 180 * s),  # edits settled
+        "busy": (hour_ago, now - 600 * s, now - 10 * s),  # keeps editing, capped at the interval
+        "typing": (hour_ago, now - 100 * s, now - 100 * s),  # due in 20s
+        "clean": (hour_ago, None, None),
+        "just_ran": (now - 60 * s, now - 200 * s, now - 200 * s),  # dirty, but ran a minute ago
+    }
+    ids = {}
+    for name, (last_run_at, dirty_since, changed_at) in rows.items():
+        u = django_user_model.objects.create_user(username=name, password="x")
+        CloudBackupSettings.objects.create(
+            user=u,
+            enabled=True,
+            last_run_at=last_run_at,
+            dirty_since=dirty_since,
+            changed_at=changed_at,
+        )
+        ids[name] = u.id
+    off = django_user_model.objects.create_user(username="off", password="x")
+    CloudBackupSettings.objects.create(user=off, enabled=False)
+    # Schedule columns written directly: store the due times the app would have.
+    CloudBackupSettings.objects.update(next_due_at=next_backup_due())
+
+    cmd = run_backup_worker.Command(stdout=io.StringIO(), stderr=io.StringIO())
+    monkeypatch.setattr(run_backup_worker, "DUE_BATCH_SIZE", 2)
+    assert [r.user_id for r in cmd._claim_due_rows(now)] == [ids["never"], ids["stale"]]
+    assert [r.user_id for r in cmd._claim_due_rows(now)] == [ids["busy"], ids["quiet"]]
+    assert cmd._claim_due_rows(now) == []
+
+    # Claimed rows are leased; released and run, "typing" is the next one due.
+    CloudBackupSettings.objects.filter(leased_until__isnull=False).update(
+        leased_until=None, last_run_at=now, dirty_since=None
+    )
+    CloudBackupSettings.objects.update(next_due_at=next_backup_due())
+    assert 10 < cmd._seconds_until_next_due() <= 20
+
+    CloudBackupSettings.objects.update(enabled=False)
+    assert cmd._seconds_until_next_due() == run_backup_worker.MAX_SLEEP_SECONDS
+
+
+def test_changes_mark_backup_dirty(enabled_user, client):
+    from apps.reports.services import import_csv
+
+    def dirty():
+        qs = CloudBackupSettings.objects.values_list("dirty_since", "changed_at")
+        return qs.get(user=enabled_user)
+
+    assert dirty() == (None, None)
+    app = JobApplication.objects.create(user=enabled_user, title="Dev", company="ACME")
+    first, changed = dirty()
+    assert first is not None and changed == first
+
+    client.force_login(enabled_user)
+    client.post(reverse("applications:update_status", args=[app.pk]), {"status": "offer"})
+    app.delete()
+    import_csv(enabled_user, b"id,title,company\n,Ops,ACME\n")
+    since, changed = dirty()
+    assert since == first and changed > first
+
+
+def test_next_due_at_follows_runs_and_edits(enabled_user, uploads):
+    from apps.reports.models import BACKUP_DEBOUNCE, BACKUP_RECHECK_EVERY
+
+    def settings_row():
+        return CloudBackupSettings.objects.get(user=enabled_user)
+
+    # Never ran: due right away, edits or not.
+    app = JobApplication.objects.create(user=enabled_user, title="Dev", company="ACME")
+    assert settings_row().next_due_at is None
+
+    _tick()
+    s = settings_row()
+    assert s.next_due_at == s.last_run_at + BACKUP_RECHECK_EVERY
+
+    app.title = "Senior Dev"
+    app.save()
+    s = settings_row()
+    assert s.next_due_at == max(s.last_run_at + s.interval, s.changed_at + BACKUP_DEBOUNCE)
+
+
+def test_run_clears_dirty_unless_changed_meanwhile(enabled_user, uploads):
+    JobApplication.objects.create(user=enabled_user, title="Dev", company="ACME")
+    _tick()
+    assert uploads == [enabled_user.id]
+    s = CloudBackupSettings.objects.get(user=enabled_user)
+    assert s.dirty_since is None and s.leased_until is None
+
+    # An edit landing after the run started keeps the row dirty.
+    run_started = timezone.now()
+    JobApplication.objects.create(user=enabled_user, title="Ops", company="ACME")
+    run_backup_worker.Command._mark_run(s, run_started, clean=True)
+    assert CloudBackupSettings.objects.get(user=enabled_user).dirty_since is not None
+
+
+def test_leased_rows_are_skipped_until_the_lease_expires(django_user_model, db):
+    u = django_user_model.objects.create_user(username="u", password="x")
+    CloudBackupSettings.objects.create(user=u, enabled=True)
+    now = timezone.now()
+    worker_a = run_backup_worker.Command(stdout=io.StringIO(), stderr=io.StringIO())
+    worker_b = run_backup_worker.Command(stdout=io.StringIO(), stderr=io.StringIO())
+
+    assert [s.user_id for s in worker_a._claim_due_rows(now)] == [u.id]
+    assert worker_b._claim_due_rows(now) == []
+    assert worker_b._seconds_until_next_due() == run_backup_worker.MAX_SLEEP_SECONDS
+
+    # Worker A still running it: the lease is renewed past B's clock.
+    worker_a._in_flight.add(u.id)
+    later = now + timedelta(seconds=settings.BACKUP_LEASE_SECONDS + 1)
+    worker_a._renew_leases(later)
+    assert worker_b._claim_due_rows(later) == []
+
+    # Worker A died: once the lease is out, B takes over.
+    much_later = later + timedelta(seconds=settings.BACKUP_LEASE_SECONDS + 1)
+    assert [s.user_id for s in worker_b._claim_due_rows(much_later)] == [u.id]
+
+
+def test_deltas_carry_changes_and_deletions_between_full_snapshots(
+    enabled_user, uploaded_files, settings
+):
+    from apps.reports.models import BackupTombstone
+
+    settings.DRIVE_BACKUP_FULL_EVERY = 2
+    keep = JobApplication.objects.create(user=enabled_user, title="Keep", company="ACME")
+    gone = JobApplication.objects.create(user=enabled_user, title="Gone", company="ACME")
+    _tick()
+    assert [kind for kind, _ in uploaded_files] == ["full"]
+
+    # Rows older than the watermark (minus the overlap) stay out of the delta.
+    JobApplication.objects.filter(pk=keep.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+    CloudBackupSettings.objects.filter(user=enabled_user).update(backup_watermark=timezone.now())
+    new = JobApplication.objects.create(user=enabled_user, title="New", company="ACME")
+    gone_id = gone.pk
+    gone.delete()
+    _make_due(enabled_user)
+    _tick()
+
+    kind, body = uploaded_files[-1]
+    lines = body.splitlines()
+    assert kind == "delta"
+    assert lines[0].endswith(",notes,deleted")
+    assert [line.split(",")[0] for line in lines[1:]] == [str(new.pk), str(gone_id)]
+    assert lines[-1] == f"{gone_id},,,,,,,,,1"
+
+    new.title = "Newer"
+    new.save()
+    _make_due(enabled_user)
+    _tick()
+    assert [kind for kind, _ in uploaded_files] == ["full", "delta", "delta"]
+
+    # DRIVE_BACKUP_FULL_EVERY deltas later the chain starts over.
+    new.delete()
+    _make_due(enabled_user)
+    _tick()
+    assert uploaded_files[-1][0] == "full"
+    s = CloudBackupSettings.objects.get(user=enabled_user)
+    assert s.deltas_since_full == 0
+    # Within DELTA_OVERLAP of the snapshot, so the next delta still carries it.
+    assert BackupTombstone.objects.filter(user=enabled_user).count() == 2
+
+
+def test_deleting_the_user_leaves_no_tombstones(enabled_user):
+    from apps.reports.models import BackupTombstone
+
+    JobApplication.objects.create(user=enabled_user, title="Dev", company="ACME")
+    enabled_user.delete()
+    assert not BackupTombstone.objects.exists()
+
+
+def test_per_user_interval_and_retention_are_clamped_and_honoured(
+    django_user_model, db, settings, monkeypatch
+):
+    from django.core.management import call_command
+
+    settings.BACKUP_INTERVAL_MIN_MINUTES = 5
+    settings.BACKUP_INTERVAL_MAX_MINUTES = 120
+    settings.DRIVE_BACKUP_KEEP_MAX = 4
+    now = timezone.now()
+    ids = {}
+    # Edited 10 minutes ago, last backup 30 minutes ago.
+    for name in ("default", "heavy", "too_eager"):
+        u = django_user_model.objects.create_user(
+            username=name, email=f"{name}@example.com", password="x"
+        )
+        CloudBackupSettings.objects.create(
+            user=u,
+            enabled=True,
+            last_run_at=now - timedelta(minutes=30),
+            dirty_since=now - timedelta(minutes=10),
+            changed_at=now - timedelta(minutes=10),
+        )
+        ids[name] = u.id
+    # Schedule columns written directly: store the due times the app would have.
+    CloudBackupSettings.objects.update(next_due_at=next_backup_due())
+
+    out = io.StringIO()
+    call_command(
+        "set_backup_policy", email="heavy@example.com", interval="60", keep="9", stdout=out
+    )
+    assert "keep 4" in out.getvalue()
+    # Stored below the minimum (e.g. before the limit was raised): still treated as 5.
+    too_eager = CloudBackupSettings.objects.filter(user_id=ids["too_eager"])
+    too_eager.update(backup_interval_minutes=1)
+    too_eager.update(next_due_at=next_backup_due())
+
+    heavy = CloudBackupSettings.objects.get(user_id=ids["heavy"])
+    assert (heavy.backup_interval_minutes, heavy.keep) == (60, 4)
+    # The command re-folded the 60 minute interval into the stored due time.
+    assert heavy.next_due_at == heavy.last_run_at + timedelta(minutes=60)
+
+    cmd = run_backup_worker.Command(stdout=io.StringIO(), stderr=io.StringIO())
+    due = sorted(r.user_id for r in cmd._claim_due_rows(now))
+    assert due == sorted([ids["default"], ids["too_eager"]])
+
+    kept = []
+    monkeypatch.setattr(
+        run_backup_worker,
+        "get_drive_status",
+        lambda user: {"connected": True, "has_refresh_token": True},
+    )
+    monkeypatch.setattr(
+        run_backup_worker, "upload_backup_rotate", lambda **kw: kept.append(kw["keep"])
+    )
+    cmd._backup_user(heavy, now)
+    assert kept == [4]
+
+    call_command(
+        "set_backup_policy", email="heavy@example.com", interval="default", stdout=io.StringIO()
+    )
+    assert CloudBackupSettings.objects.get(user_id=ids["heavy"]).backup_interval_minutes is None
+
+
+def test_inline_run_renews_its_lease_before_uploading(enabled_user, uploads, monkeypatch):
+    JobApplication.objects.create(user=enabled_user, title="Dev", company="ACME")
+    real_iter_csv = run_backup_worker.iter_csv
+
+    def slow_export(*args, **kwargs):
+        # The export outlived the lease taken at claim time.
+        CloudBackupSettings.objects.filter(user=enabled_user).update(
+            leased_until=timezone.now() - timedelta(seconds=1)
+        )
+        yield from real_iter_csv(*args, **kwargs)
+
+    leases = []
+
+    def upload(**kw):
+        leases.append(CloudBackupSettings.objects.get(user=enabled_user).leased_until)
+
+    monkeypatch.setattr(run_backup_worker, "iter_csv", slow_export)
+    monkeypatch.setattr(run_backup_worker, "upload_backup_rotate", upload)
+    _tick(concurrency=1)
+
+    # Another replica can't claim the user while the upload runs.
+    assert leases and leases[0] > timezone.now()
+
+
+def test_lost_backups_folder_gets_a_full_backup_not_a_delta(enabled_user, monkeypatch, settings):
+    import apps.reports.drive as drive_mod
+    from tests.test_drive import _DriveService
+
+    settings.DRIVE_BACKUP_GZIP = False
+    service = _DriveService()
+    monkeypatch.setattr(drive_mod, "_service", lambda user: service)
+    monkeypatch.setattr(
+        run_backup_worker,
+        "get_drive_status",
+        lambda user: {"connected": True, "has_refresh_token": True},
+    )
+
+    def _names(folder_id):
+        files = service._files
+        ids = files._files_by_parent.get(folder_id, [])
+        return sorted(files._files_by_id[fid]["name"] for fid in ids)
+
+    JobApplication.objects.create(user=enabled_user, title="A", company="ACME")
+    _tick()
+    old_folder = CloudBackupSettings.objects.get(user=enabled_user).drive_backups_folder_id
+    assert _names(old_folder) == ["autobackup_latest.csv"]
+
+    # The JobApplication folder is deleted on Drive; the next two runs would be deltas.
+    service._files._folders.clear()
+    for title in ("B", "C"):
+        JobApplication.objects.create(user=enabled_user, title=title, company="ACME")
+        _make_due(enabled_user)
+        _tick()
+
+    s = CloudBackupSettings.objects.get(user=enabled_user)
+    assert s.drive_backups_folder_id not in ("", old_folder)
+    names = _names(s.drive_backups_folder_id)
+    delta = [n for n in names if n.startswith("autobackup_delta_")]
+    assert len(delta) == 1 and set(names) == {"autobackup_latest.csv", delta[0]}
+    assert s.deltas_since_full == 1
+
+    # The delta restores on top of the snapshot in the new folder.
+    files = service._files
+    delta_id = next(fid for fid, meta in files._files_by_id.items() if meta["name"] == delta[0])
+    chain = drive_mod.backup_chain(enabled_user, delta_id)
+    assert [f.name for f in chain] == ["autobackup_latest.csv", delta[0]]
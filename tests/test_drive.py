@@ -1,7 +1,10 @@
 import io
+import json
 from types import SimpleNamespace
 
+import httplib2
 import pytest
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
 
 from allauth.socialaccount.models import SocialAccount, SocialApp, SocialToken
@@ -15,8 +18,17 @@ from apps.reports.drive import (
     get_drive_status,
     upload_backup,
     list_backups,
+    list_backups_page,
     download_file,
+    iter_download,
+    upload_backup_rotate,
     upload_backup_rotate_3,
+    upload_backup_delta,
+    backup_chain,
+    _restore_chain,
+    _service,
+    _service_cache,
+    disconnect_drive,
 )
 
 
@@ -26,11 +38,117 @@ def _make_http_error(status: int) -> HttpError:
 
 
 class _Execute:
-    def __init__(self, payload):
-        self._payload = payload
+    """
+    A prepared request: nothing happens until execute(), which counts as one
+    HTTP round trip unless the request was added to a batch.
+    """
+
+    def __init__(self, resource, method, fn):
+        self._resource = resource
+        self._method = method
+        self._fn = fn
 
     def execute(self):
-        return self._payload
+        self._resource.requests.append(self._method)
+        return self._fn()
+
+
+class _Batch:
+    def __init__(self, resource, callback=None):
+        self._resource = resource
+        self._callback = callback
+        self._items = []
+
+    def add(self, request, request_id=None):
+        self._items.append((request_id, request))
+
+    def execute(self):
+        self._resource.requests.append("batch")
+        self._resource.batched.extend(req._method for _, req in self._items)
+        for request_id, req in self._items:
+            try:
+                response, exception = req._fn(), None
+            except HttpError as e:
+                response, exception = None, e
+            if self._callback:
+                self._callback(request_id, response, exception)
+
+
+class _SessionHttp:
+    """
+    Drive's side of a resumable session URI: an empty PUT ("bytes */*") reports
+    the confirmed bytes, a PUT with a body appends one chunk.
+    """
+
+    def __init__(self, resource, finish):
+        self._resource = resource
+        self._finish = finish
+
+    def request(self, uri, method="GET", body=None, headers=None):
+        r = self._resource
+        assert method == "PUT"
+        r.requests.append("upload_chunk" if body else "upload_status")
+        if uri not in r.sessions:
+            return httplib2.Response({"status": 404}), b"{}"
+        received = r.sessions[uri]
+        if body:
+            first, total = headers["Content-Range"].removeprefix("bytes ").split("/")
+            start = int(first.split("-")[0])
+            if start in r.fail_at_offsets:
+                r.fail_at_offsets.discard(start)
+                return httplib2.Response({"status": 503}), b"{}"
+            assert start == len(received), "chunk must start at the confirmed offset"
+            received += body
+            if len(received) == int(total):
+                meta = self._finish(bytes(r.sessions.pop(uri)))
+                return httplib2.Response({"status": 200}), json.dumps(meta).encode()
+        info = {"status": 308}
+        if received:
+            info["range"] = f"bytes=0-{len(received) - 1}"
+        return httplib2.Response(info), b""
+
+
+class _ResumableRequest:
+    """
+    Resumable media upload against the fake's session store. Sessions survive the
+    request object, like Drive's session URIs do.
+    """
+
+    def __init__(self, resource, media, finish):
+        self._resource = resource
+        self._media = media
+        self._finish = finish
+        self.resumable = media
+        self.http = _SessionHttp(resource, finish)
+        self.resumable_uri = None
+        self.resumable_progress = 0
+        self._in_error_state = False
+
+    def next_chunk(self, num_retries=0):
+        r = self._resource
+        r.requests.append("upload_chunk")
+        if self.resumable_uri is None:
+            self.resumable_uri = f"https://upload.example/session-{len(r.sessions) + 1}"
+            r.sessions[self.resumable_uri] = bytearray()
+        elif self._in_error_state:
+            if self.resumable_uri not in r.sessions:
+                raise _make_http_error(404)
+            self.resumable_progress = len(r.sessions[self.resumable_uri])
+            self._in_error_state = False
+
+        if self.resumable_progress in r.fail_at_offsets:
+            r.fail_at_offsets.discard(self.resumable_progress)
+            self._in_error_state = True
+            raise _make_http_error(503)
+
+        stream = self._media.stream()
+        stream.seek(self.resumable_progress)
+        data = stream.read(self._media.chunksize())
+        r.sessions[self.resumable_uri] += data
+        self.resumable_progress += len(data)
+        if self.resumable_progress < self._media.size():
+            return (SimpleNamespace(resumable_progress=self.resumable_progress), None)
+        return (None, self._finish(bytes(r.sessions.pop(self.resumable_uri))))
 
 
 class _FilesResource:
@@ -38,6 +156,11 @@ class _FilesResource:
         self._folders = {}
         self._files_by_id = {}
         self._files_by_parent = {}
+        self.requests = []  # HTTP round trips, "batch" counts once
+        self.batched = []  # requests sent inside batches
+        self.sessions = {}  # resumable upload uri -> bytes received
+        self.fail_at_offsets = set()  # resumable chunks starting here fail once
+        self.uploaded = {}
 
         self._id_seq = 1
 
@@ -46,73 +169,121 @@ class _FilesResource:
         self._id_seq += 1
         return str(i)
 
-    def list(self, q=None, fields=None, pageSize=None, orderBy=None):
+    def _request(self, method, fn):
+        return _Execute(self, method, fn)
+
+    def list(self, q=None, fields=None, pageSize=None, orderBy=None, pageToken=None):
         if q and "mimeType='application/vnd.google-apps.folder'" in q:
             name = q.split("name='", 1)[1].split("'", 1)[0]
             parent_id = None
             if "in parents" in q:
                 parent_id = q.split("and '", 1)[1].split("'", 1)[0]
-            folder_id = self._folders.get((name, parent_id))
-            files = []
-            if folder_id:
-                files = [{"id": folder_id, "name": name}]
-            return _Execute({"files": files})
+
+            def _find():
+                folder_id = self._folders.get((name, parent_id))
+                return {"files": [{"id": folder_id, "name": name}] if folder_id else []}
+
+            return self._request("list", _find)
 
         if q and "in parents" in q and "trashed=false" in q:
             parent_id = q.split("'", 2)[1]
             if "and name='" in q:
                 name = q.split("and name='", 1)[1].split("'", 1)[0]
-                file_id = None
-                for fid in self._files_by_parent.get(parent_id, []):
-                    if self._files_by_id[fid]["name"] == name:
-                        file_id = fid
-                        break
-                files = []
-                if file_id:
-                    meta = self._files_by_id[file_id]
-                    files = [{"id": file_id, "name": meta["name"]}]
-                return _Execute({"files": files})
-
-            ids = list(self._files_by_parent.get(parent_id, []))
-            metas = [self._files_by_id[fid] for fid in ids]
-            metas.sort(key=lambda x: x.get("createdTime", ""), reverse=True)
-            out = [{"id": m["id"], "name": m["name"], "mimeType": m["mimeType"]} for m in metas[: pageSize or 100]]
-            return _Execute({"files": out})
-
-        return _Execute({"files": []})
+
+                def _by_name():
+                    for fid in self._files_by_parent.get(parent_id, []):
+                        if self._files_by_id[fid]["name"] == name:
+                            return {"files": [{"id": fid, "name": name}]}
+                    return {"files": []}
+
+                return self._request("list", _by_name)
+
+            contains = ""
+            if "name contains '" in q:
+                contains = q.split("name contains '", 1)[1].split("'", 1)[0]
+
+            def _children():
+                ids = list(self._files_by_parent.get(parent_id, []))
+                metas = [self._files_by_id[fid] for fid in ids]
+                metas = [m for m in metas if contains in m["name"]]
+                metas.sort(key=lambda x: x.get("createdTime", ""), reverse=True)
+                start = int(pageToken or 0)
+                end = start + (pageSize or 100)
+                out = {"files": [dict(m) for m in metas[start:end]]}
+                if end < len(metas):
+                    out["nextPageToken"] = str(end)
+                return out
+
+            return self._request("list", _children)
+
+        return self._request("list", lambda: {"files": []})
 
     def create(self, body=None, media_body=None, fields=None):
         if body and body.get("mimeType") == "application/vnd.google-apps.folder":
             name = body["name"]
             parent_id = (body.get("parents") or [None])[0]
-            existing = self._folders.get((name, parent_id))
-            if existing:
-                return _Execute({"id": existing})
-            folder_id = self._new_id()
-            self._folders[(name, parent_id)] = folder_id
-            return _Execute({"id": folder_id})
+
+            def _create_folder():
+                existing = self._folders.get((name, parent_id))
+                if existing:
+                    return {"id": existing}
+                folder_id = self._new_id()
+                self._folders[(name, parent_id)] = folder_id
+                return {"id": folder_id}
+
+            return self._request("create", _create_folder)
 
         name = body["name"]
         parent_id = (body.get("parents") or [None])[0]
-        file_id = self._new_id()
-        meta = {"id": file_id, "name": name, "mimeType": getattr(media_body, "mimetype", "application/octet-stream")}
-        self._files_by_id[file_id] = meta
-        self._files_by_parent.setdefault(parent_id, []).append(file_id)
-        return _Execute(meta)
+
+        def _create_file(data=None):
+            if parent_id not in self._folders.values():
+                raise _make_http_error(404)
+            if data is None and media_body is not None:
+                data = media_body.getbytes(0, media_body.size())
+            file_id = self._new_id()
+            self.uploaded[file_id] = data
+            h, m, s = self._id_seq // 3600, self._id_seq // 60 % 60, self._id_seq % 60
+            meta = {
+                "id": file_id,
+                "name": name,
+                "mimeType": (
+                    media_body.mimetype() if media_body is not None else "application/octet-stream"
+                ),
+                "createdTime": f"2025-01-01T{h:02d}:{m:02d}:{s:02d}Z",
+                "size": str(len(data or b"")),
+                "parents": [parent_id],
+            }
+            self._files_by_id[file_id] = meta
+            self._files_by_parent.setdefault(parent_id, []).append(file_id)
+            return meta
+
+        if media_body is not None and media_body.resumable():
+            return _ResumableRequest(self, media_body, _create_file)
+        return self._request("create", _create_file)
 
     def update(self, fileId=None, body=None):
-        meta = self._files_by_id[fileId]
-        meta["name"] = body["name"]
-        return _Execute({"id": fileId})
+        def _update():
+            meta = self._files_by_id[fileId]
+            meta["name"] = body["name"]
+            return {"id": fileId}
+
+        return self._request("update", _update)
 
     def delete(self, fileId=None):
-        meta = self._files_by_id.pop(fileId, None)
-        if meta:
-            for parent_id, ids in list(self._files_by_parent.items()):
-                if fileId in ids:
-                    ids.remove(fileId)
-                    self._files_by_parent[parent_id] = ids
-        return _Execute({})
+        def _delete():
+            meta = self._files_by_id.pop(fileId, None)
+            if meta:
+                for parent_id, ids in list(self._files_by_parent.items()):
+                    if fileId in ids:
+                        ids.remove(fileId)
+                        self._files_by_parent[parent_id] = ids
+            return {}
+
+        return self._request("delete", _delete)
+
+    def get(self, fileId=None, fields=None):
+        return self._request("get", lambda: dict(self._files_by_id[fileId]))
 
     def get_media(self, fileId=None):
         content = f"file:{fileId}".encode("utf-8")
@@ -126,19 +297,35 @@ class _DriveService:
     def files(self):
         return self._files
 
+    def new_batch_http_request(self, callback=None):
+        return _Batch(self._files, callback)
+
 
 class _Downloader:
-    def __init__(self, fh: io.BytesIO, request):
+    def __init__(self, fh: io.BytesIO, request, chunksize=100 * 1024 * 1024):
         self._fh = fh
         self._req = request
-        self._done = False
+        self._chunksize = chunksize
+        self._pos = 0
 
     def next_chunk(self):
-        if self._done:
-            return (None, True)
-        self._fh.write(self._req._content)
-        self._done = True
-        return (None, True)
+        content = self._req._content
+        self._fh.write(content[self._pos : self._pos + self._chunksize])
+        self._pos += self._chunksize
+        return (None, self._pos >= len(content))
+
+
+@pytest.fixture(autouse=True)
+def _clear_service_cache(monkeypatch):
+    import apps.reports.drive as drive_mod
+
+    monkeypatch.setattr(drive_mod, "_sleep", lambda seconds: None)
+    monkeypatch.setattr(drive_mod, "_throttle", drive_mod._TokenBucket(rate=0))
+    _service_cache.clear()
+    cache.clear()
+    yield
+    _service_cache.clear()
+    cache.clear()
 
 
 @pytest.fixture
@@ -272,3 +459,510 @@ def test_rotate_3_happy_path(monkeypatch, connect_google, user):
     assert "autobackup-1.csv" in names
     assert "autobackup-2.csv" in names
     assert len([n for n in names if n.startswith("autobackup")]) == 3
+
+
+def test_upload_backup_accepts_stream(monkeypatch, connect_google, user):
+    service = _DriveService()
+
+    import apps.reports.drive as drive_mod
+
+    monkeypatch.setattr(drive_mod, "build", lambda *a, **k: service)
+    seen = {}
+
+    def _create(body=None, media_body=None, fields=None):
+        if media_body is not None:
+            seen["resumable"] = media_body.resumable()
+            seen["size"] = media_body.size()
+        return _FilesResource.create(
+            service._files, body=body, media_body=media_body, fields=fields
+        )
+
+    monkeypatch.setattr(service._files, "create", _create)
+
+    small = upload_backup(
+        user=user, filename="s.csv", content_bytes=io.BytesIO(b"x" * 10), mime_type="text/csv"
+    )
+    assert small.name == "s.csv"
+    assert seen == {"resumable": False, "size": 10}
+
+    big = io.BytesIO(b"x" * (drive_mod.UPLOAD_CHUNK_SIZE + 1))
+    upload_backup(user=user, filename="b.csv", content_bytes=big, mime_type="text/csv")
+    assert seen == {"resumable": True, "size": drive_mod.UPLOAD_CHUNK_SIZE + 1}
+
+
+def test_service_is_cached_per_token(monkeypatch, connect_google, user, django_assert_num_queries):
+    import apps.reports.drive as drive_mod
+
+    builds = []
+
+    def _build(*a, **k):
+        builds.append(k)
+        return _DriveService()
+
+    monkeypatch.setattr(drive_mod, "build", _build)
+
+    first = _service(user)
+    with django_assert_num_queries(1):
+        assert _service(user) is first
+    assert len(builds) == 1
+    assert builds[0]["static_discovery"] is True
+
+    _, tok = connect_google
+    tok.token_secret = "refresh-2"
+    tok.save()
+    assert _service(user) is not first
+    assert len(builds) == 2
+
+    disconnect_drive(user)
+    with pytest.raises(PermissionDenied):
+        _service(user)
+
+
+def test_service_cache_expires(monkeypatch, connect_google, user):
+    import apps.reports.drive as drive_mod
+
+    monkeypatch.setattr(drive_mod, "build", lambda *a, **k: _DriveService())
+    monkeypatch.setattr(_service_cache, "ttl", -1)
+    first = _service(user)
+    assert _service(user) is not first
+
+
+def test_service_cache_is_per_thread():
+    import threading
+
+    from apps.reports.drive import _ServiceCache
+
+    cache_ = _ServiceCache(ttl=60, max_size=10)
+    cache_.put(1, ("k",), "main")
+    seen = []
+
+    def _other_thread():
+        seen.append(cache_.get(1, ("k",)))
+        cache_.put(1, ("k",), "other")
+
+    t = threading.Thread(target=_other_thread)
+    t.start()
+    t.join()
+
+    # httplib2 isn't thread-safe: a thread never gets another thread's service.
+    assert seen == [None]
+    assert cache_.get(1, ("k",)) == "main"
+
+    cache_.invalidate(1)
+    assert cache_.get(1, ("k",)) is None
+    assert not cache_._entries
+
+
+def test_folder_ids_are_persisted_and_reresolved_on_404(monkeypatch, connect_google, user):
+    from apps.reports.models import CloudBackupSettings
+
+    service = _DriveService()
+
+    import apps.reports.drive as drive_mod
+
+    monkeypatch.setattr(drive_mod, "build", lambda *a, **k: service)
+    files = service._files
+
+    upload_backup(user=user, filename="a.csv", content_bytes=b"a", mime_type="text/csv")
+    s = CloudBackupSettings.objects.get(user=user)
+    assert s.drive_backups_folder_id == files._folders[("backups", s.drive_root_folder_id)]
+
+    files.requests.clear()
+    upload_backup(user=user, filename="b.csv", content_bytes=b"b", mime_type="text/csv")
+    assert files.requests == ["create"]
+
+    # Folder deleted on Drive: the upload 404s once, then lands in a fresh folder.
+    files._folders.clear()
+    files.requests.clear()
+    up = upload_backup(user=user, filename="c.csv", content_bytes=b"c", mime_type="text/csv")
+    assert up.name == "c.csv"
+    s.refresh_from_db()
+    assert s.drive_backups_folder_id == files._folders[("backups", s.drive_root_folder_id)]
+    assert files.requests.count("list") == 2  # root + backups lookups
+
+
+def _backup_names(user):
+    return sorted(x.name for x in list_backups(user=user, limit=100))
+
+
+def test_rotate_lists_once_and_batches_changes(monkeypatch, connect_google, user):
+    service = _DriveService()
+
+    import apps.reports.drive as drive_mod
+
+    monkeypatch.setattr(drive_mod, "build", lambda *a, **k: service)
+    files = service._files
+
+    for body in (b"a", b"b", b"c"):
+        upload_backup_rotate_3(user=user, content_bytes=body, ext="csv")
+
+    files.requests.clear()
+    files.batched.clear()
+    upload_backup_rotate_3(user=user, content_bytes=b"d", ext="csv")
+
+    # folder ids are persisted: listing + one batch + upload
+    assert files.requests == ["list", "batch", "create"]
+    assert sorted(files.batched) == ["delete", "update", "update"]
+    assert _backup_names(user) == ["autobackup-1.csv", "autobackup-2.csv", "autobackup_latest.csv"]
+
+
+def test_rotate_first_run_skips_batch(monkeypatch, connect_google, user):
+    service = _DriveService()
+
+    import apps.reports.drive as drive_mod
+
+    monkeypatch.setattr(drive_mod, "build", lambda *a, **k: service)
+    upload_backup(user=user, filename="manual_backup.csv", content_bytes=b"m", mime_type="text/csv")
+    service._files.requests.clear()
+
+    upload_backup_rotate(user=user, content_bytes=b"a", keep=3)
+    assert service._files.requests == ["list", "create"]
+
+
+def test_rotate_configurable_retention(monkeypatch, connect_google, user):
+    service = _DriveService()
+
+    import apps.reports.drive as drive_mod
+
+    monkeypatch.setattr(drive_mod, "build", lambda *a, **k: service)
+
+    for i in range(7):
+        upload_backup_rotate(user=user, content_bytes=str(i).encode(), keep=5)
+    assert _backup_names(user) == [
+        "autobackup-1.csv",
+        "autobackup-2.csv",
+        "autobackup-3.csv",
+        "autobackup-4.csv",
+        "autobackup_latest.csv",
+    ]
+
+    # Lowering the retention drops the surplus slots on the next run.
+    upload_backup_rotate(user=user, content_bytes=b"x", keep=2)
+    assert _backup_names(user) == ["autobackup-1.csv", "autobackup_latest.csv"]
+
+    with pytest.raises(ValueError):
+        upload_backup_rotate(user=user, content_bytes=b"x", keep=0)
+
+
+def test_delta_backups_chain_onto_the_latest_snapshot(monkeypatch, connect_google, user):
+    service = _DriveService()
+
+    import apps.reports.drive as drive_mod
+
+    monkeypatch.setattr(drive_mod, "build", lambda *a, **k: service)
+
+    upload_backup_rotate(user=user, content_bytes=b"full-1", keep=3)
+    d1 = upload_backup_delta(user=user, content_bytes=b"d1")
+    d2 = upload_backup_delta(user=user, content_bytes=b"d2")
+    assert d1.name.startswith("autobackup_delta_") and d1.name < d2.name
+
+    assert [f.name for f in backup_chain(user, d1.file_id)] == ["autobackup_latest.csv", d1.name]
+    latest = [f for f in list_backups(user) if f.name == "autobackup_latest.csv"][0]
+    chain = backup_chain(user, latest.file_id)
+    assert [f.name for f in chain] == ["autobackup_latest.csv", d1.name, d2.name]
+
+    # A new snapshot supersedes the deltas; the previous one restores on its own.
+    upload_backup_rotate(user=user, content_bytes=b"full-2", keep=3)
+    assert _backup_names(user) == ["autobackup-1.csv", "autobackup_latest.csv"]
+    previous = [f for f in list_backups(user) if f.name == "autobackup-1.csv"][0]
+    assert [f.file_id for f in backup_chain(user, previous.file_id)] == [previous.file_id]
+
+    with pytest.raises(DriveError):
+        _restore_chain([d1], d1)
+
+
+def test_resumable_upload_continues_from_saved_session(monkeypatch, settings, connect_google, user):
+    from apps.reports.models import CloudBackupSettings
+
+    settings.DRIVE_UPLOAD_CHUNK_SIZE = 256 * 1024
+    service = _DriveService()
+
+    import apps.reports.drive as drive_mod
+
+    monkeypatch.setattr(drive_mod, "build", lambda *a, **k: service)
+    files = service._files
+    payload = bytes(range(256)) * 4096  # 1 MiB = 4 chunks
+
+    small = upload_backup(
+        user=user, filename="s.csv", content_bytes=io.BytesIO(b"small"), mime_type="text/csv"
+    )
+    assert files.requests[-1] == "create"  # single request, no session
+    assert files.uploaded[small.file_id] == b"small"
+
+    monkeypatch.setattr(drive_mod, "RETRY_MAX_ATTEMPTS", 0)
+    files.fail_at_offsets = {2 * 256 * 1024}
+    with pytest.raises(DriveError):
+        upload_backup(
+            user=user, filename="big.csv", content_bytes=io.BytesIO(payload), mime_type="text/csv"
+        )
+    s = CloudBackupSettings.objects.get(user=user)
+    assert s.upload_session_uri in files.sessions
+    assert len(files.sessions[s.upload_session_uri]) == 2 * 256 * 1024
+
+    files.requests.clear()
+    monkeypatch.setattr(drive_mod, "RETRY_MAX_ATTEMPTS", 1)
+    monkeypatch.setattr(drive_mod, "_sleep", lambda seconds: None)
+    files.fail_at_offsets = {3 * 256 * 1024}
+    up = upload_backup(
+        user=user, filename="big.csv", content_bytes=io.BytesIO(payload), mime_type="text/csv"
+    )
+    assert files.uploaded[up.file_id] == payload
+    # Chunks 3 and 4 only; the retry of chunk 4 asks for the offset again first.
+    assert files.requests == [
+        "upload_status", "upload_chunk", "upload_chunk", "upload_status", "upload_chunk"
+    ]
+
+    s.refresh_from_db()
+    assert (s.upload_session_uri, s.upload_session_key) == ("", "")
+
+
+def test_resumable_upload_restarts_expired_session(monkeypatch, settings, connect_google, user):
+    settings.DRIVE_UPLOAD_CHUNK_SIZE = 256 * 1024
+    service = _DriveService()
+
+    import apps.reports.drive as drive_mod
+
+    monkeypatch.setattr(drive_mod, "build", lambda *a, **k: service)
+    files = service._files
+    payload = b"x" * (600 * 1024)
+
+    monkeypatch.setattr(drive_mod, "RETRY_MAX_ATTEMPTS", 0)
+    files.fail_at_offsets = {256 * 1024}
+    with pytest.raises(DriveError):
+        upload_backup(
+            user=user, filename="big.csv", content_bytes=io.BytesIO(payload), mime_type="text/csv"
+        )
+
+    files.sessions.clear()
+    up = upload_backup(
+        user=user, filename="big.csv", content_bytes=io.BytesIO(payload), mime_type="text/csv"
+    )
+    assert files.uploaded[up.file_id] == payload
+
+
+def test_iter_download_yields_bounded_chunks(monkeypatch, connect_google, user):
+    service = _DriveService()
+
+    import apps.reports.drive as drive_mod
+
+    monkeypatch.setattr(drive_mod, "build", lambda *a, **k: service)
+    monkeypatch.setattr(drive_mod, "MediaIoBaseDownload", _Downloader)
+
+    chunks = list(iter_download(user, "abc", chunk_size=3))
+    assert chunks == [b"fil", b"e:a", b"bc"]
+    assert download_file(user, "abc") == b"file:abc"
+
+
+def test_refreshed_token_is_written_back(monkeypatch, connect_google, user):
+    from datetime import datetime, timedelta, timezone as dt_timezone
+
+    from google.oauth2.credentials import Credentials
+
+    _, tok = connect_google
+    tok.expires_at = datetime.now(dt_timezone.utc) + timedelta(minutes=1)
+    tok.save()
+
+    creds = _credentials_from_allauth(user)
+    assert creds.expired  # inside google-auth's refresh window: refreshed before the next request
+
+    now = datetime.now(dt_timezone.utc).replace(tzinfo=None, microsecond=0)
+    new_expiry = now + timedelta(hours=1)
+
+    def _refresh(self, request):
+        self.token = "access-2"
+        self.expiry = new_expiry
+
+    monkeypatch.setattr(Credentials, "refresh", _refresh)
+    creds.refresh(None)
+
+    tok.refresh_from_db()
+    assert tok.token == "access-2"
+    assert tok.expires_at == new_expiry.replace(tzinfo=dt_timezone.utc)
+    assert tok.token_secret == "refresh"
+
+    fresh = _credentials_from_allauth(user)
+    assert fresh.token == "access-2"
+    assert fresh.valid
+
+
+def _flaky(errors, result="ok"):
+    calls = []
+
+    def _fn():
+        calls.append(1)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+
+    return _fn, calls
+
+
+def test_execute_retries_with_backoff_and_retry_after(monkeypatch):
+    import apps.reports.drive as drive_mod
+
+    slept = []
+    monkeypatch.setattr(drive_mod, "_sleep", slept.append)
+    monkeypatch.setattr(drive_mod.random, "uniform", lambda a, b: b)
+    drive_mod.drive_call_stats(reset=True)
+
+    import httplib2
+
+    throttled = HttpError(
+        resp=httplib2.Response({"status": 429, "retry-after": "7"}), content=b"{}"
+    )
+    fn, calls = _flaky([_make_http_error(503), throttled, ConnectionError("reset")])
+
+    assert drive_mod._execute(fn) == "ok"
+    assert len(calls) == 4
+    assert slept == [1.0, 7.0, 4.0]  # 2**n backoff, Retry-After wins when longer
+
+    stats = drive_mod.drive_call_stats()
+    assert (stats["calls"], stats["retries"]) == (4, 3)
+    assert (stats["retry_sleep"], stats["gave_up"]) == (12.0, 0)
+
+
+def test_execute_does_not_retry_creates_or_client_errors(monkeypatch):
+    import apps.reports.drive as drive_mod
+
+    fn, calls = _flaky([_make_http_error(503)])
+    with pytest.raises(HttpError):
+        drive_mod._execute(fn, idempotent=False)
+    assert len(calls) == 1
+
+    fn, calls = _flaky([_make_http_error(404)])
+    with pytest.raises(HttpError):
+        drive_mod._execute(fn)
+    assert len(calls) == 1
+
+    monkeypatch.setattr(drive_mod, "RETRY_MAX_ATTEMPTS", 2)
+    drive_mod.drive_call_stats(reset=True)
+    fn, calls = _flaky([_make_http_error(500)] * 5)
+    with pytest.raises(HttpError):
+        drive_mod._execute(fn)
+    assert len(calls) == 3
+    assert drive_mod.drive_call_stats()["gave_up"] == 1
+
+
+def test_rate_limit_403_is_retryable():
+    from apps.reports.drive import _is_retryable
+
+    resp = SimpleNamespace(status=403, reason="Forbidden")
+    err = HttpError(
+        resp=resp, content=b'{"error": {"errors": [{"reason": "userRateLimitExceeded"}]}}'
+    )
+    assert _is_retryable(err)
+    assert _friendly_http_error(err).code == "rate_limited"
+    assert not _is_retryable(_make_http_error(403))
+
+
+def test_token_bucket_paces_bursts(monkeypatch):
+    import apps.reports.drive as drive_mod
+
+    slept = []
+    monkeypatch.setattr(drive_mod, "_sleep", slept.append)
+    clock = [100.0]
+    monkeypatch.setattr(drive_mod.time, "monotonic", lambda: clock[0])
+
+    bucket = drive_mod._TokenBucket(rate=2, capacity=2)
+    waits = [bucket.acquire() for _ in range(4)]
+    assert waits == [0.0, 0.0, 0.5, 1.0]
+
+    clock[0] += 10  # refills up to capacity only
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.5]
+
+
+def test_backup_listing_is_paginated_and_cached(monkeypatch, connect_google, user):
+    from datetime import datetime, timezone as dt_timezone
+
+    service = _DriveService()
+
+    import apps.reports.drive as drive_mod
+
+    monkeypatch.setattr(drive_mod, "build", lambda *a, **k: service)
+    files = service._files
+    for i in range(5):
+        upload_backup(user=user, filename=f"b{i}.csv", content_bytes=b"x" * i, mime_type="text/csv")
+
+    first = list_backups_page(user, page_size=3)
+    assert [f.name for f in first.files] == ["b4.csv", "b3.csv", "b2.csv"]
+    assert first.files[0].size == 4
+    assert first.files[0].created_time.tzinfo == dt_timezone.utc
+    second = list_backups_page(user, page_size=3, page_token=first.next_page_token)
+    assert [f.name for f in second.files] == ["b1.csv", "b0.csv"]
+    assert second.next_page_token is None
+
+    files.requests.clear()
+    assert list_backups_page(user, page_size=3) == first
+    assert files.requests == []
+
+    upload_backup(user=user, filename="b5.csv", content_bytes=b"x", mime_type="text/csv")
+    assert list_backups_page(user, page_size=3).files[0].name == "b5.csv"
+
+    # A backup from another process shows up through last_run_at.
+    files.requests.clear()
+    list_backups_page(user, page_size=3)
+    assert files.requests == []
+    user.cloud_backup.last_run_at = datetime.now(dt_timezone.utc)
+    list_backups_page(user, page_size=3)
+    assert files.requests == ["list"]
+
+
+def test_backups_page_uses_the_settings_row_it_loaded(monkeypatch, client, connect_google, user):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from django.urls import reverse
+
+    from apps.accounts.models import UserProfile
+    from apps.reports.models import CloudBackupSettings
+
+    service = _DriveService()
+
+    import apps.reports.drive as drive_mod
+
+    monkeypatch.setattr(drive_mod, "build", lambda *a, **k: service)
+    UserProfile.objects.create(user=user, google_data_access_consent=True)
+    CloudBackupSettings.objects.create(user=user)
+    client.force_login(user)
+
+    with CaptureQueriesContext(connection) as captured:
+        r = client.get(reverse("reports:drive_backups"))
+    assert r.status_code == 200
+    assert r.context["error"] is None
+
+    s = CloudBackupSettings.objects.get(user=user)
+    assert s.drive_backups_folder_id
+    assert r.context["folder_url"].endswith(s.drive_backups_folder_id)
+    # The Drive helpers got the view's row: one lookup, no second one through the user.
+    lookups = [
+        q["sql"]
+        for q in captured.captured_queries
+        if q["sql"].startswith("SELECT") and 'FROM "reports_cloudbackupsettings"' in q["sql"]
+    ]
+    assert len(lookups) == 1, lookups
+
+
+def test_drive_export_gzip(monkeypatch, client, connect_google, user):
+    import gzip
+
+    from django.urls import reverse
+
+    from apps.accounts.models import UserProfile
+    from apps.applications.models import JobApplication
+
+    service = _DriveService()
+
+    import apps.reports.drive as drive_mod
+
+    monkeypatch.setattr(drive_mod, "build", lambda *a, **k: service)
+    UserProfile.objects.create(user=user, google_data_access_consent=True)
+    JobApplication.objects.create(user=user, title="Dev", company="ACME")
+    client.force_login(user)
+
+    r = client.get(reverse("reports:drive_export", args=["csv.gz"]))
+    assert r.status_code == 302
+
+    (file_id, data), = service._files.uploaded.items()
+    meta = service._files._files_by_id[file_id]
+    assert meta["name"].endswith(".csv.gz")
+    assert meta["mimeType"] == "application/gzip"
+    assert b"Dev,ACME" in gzip.decompress(data)
@@ -0,0 +1,222 @@
+from datetime import timedelta
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from django.utils import timezone
+
+from allauth.socialaccount.models import SocialAccount, SocialApp, SocialToken
+
+from apps.accounts.models import UserProfile
+from apps.applications.models import JobApplication
+from apps.reports.drive import DriveFile
+from apps.reports.jobs import (
+    STALE_AFTER,
+    claim_next_import_job,
+    fail_stale_import_jobs,
+    run_import_job,
+)
+from apps.reports.models import ImportJob, ImportJobSource, ImportJobStatus
+
+HEADER = "id,title,company,location,source,status,applied_at,recruiter_reply_at,notes\n"
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def user(db, django_user_model):
+    u = django_user_model.objects.create_user(username="u1", email="u1@example.com", password="x")
+    UserProfile.objects.create(user=u, google_data_access_consent=True)
+    return u
+
+
+def _upload(rows: int) -> SimpleUploadedFile:
+    body = HEADER + "".join(f",Job {i},ACME,,,applied,,,\n" for i in range(rows))
+    return SimpleUploadedFile("apps.csv", body.encode("utf-8"), "text/csv")
+
+
+def test_upload_is_queued_then_processed(client, user, monkeypatch):
+    import apps.reports.services as services_mod
+
+    monkeypatch.setattr(services_mod, "IMPORT_BATCH_SIZE", 2)
+    client.force_login(user)
+
+    r = client.post(reverse("reports:import"), {"file": _upload(5)})
+    job = ImportJob.objects.get(user=user)
+    assert r.status_code == 302
+    assert r.url.endswith(f"?job={job.id}")
+    assert job.status == ImportJobStatus.QUEUED
+    assert not JobApplication.objects.filter(user=user).exists()
+
+    progress = []
+    monkeypatch.setattr(
+        "apps.reports.jobs._ProgressReporter.__call__",
+        lambda self, created, updated: progress.append(created + updated),
+    )
+
+    claimed = claim_next_import_job()
+    assert claimed.pk == job.pk
+    assert claim_next_import_job() is None
+
+    run_import_job(claimed)
+    job.refresh_from_db()
+
+    assert job.status == ImportJobStatus.DONE
+    assert (job.rows_total, job.rows_done, job.created, job.updated) == (5, 5, 5, 0)
+    assert progress == [2, 4, 5]
+    assert not job.file
+    assert JobApplication.objects.filter(user=user).count() == 5
+
+    status = client.get(reverse("reports:import_job_status", args=[job.id])).json()
+    assert status["status"] == "done"
+    assert status["finished"] is True
+    assert status["created"] == 5
+
+
+def test_second_import_is_rejected_while_one_is_active(client, user):
+    client.force_login(user)
+    client.post(reverse("reports:import"), {"file": _upload(1)})
+    r = client.post(reverse("reports:import"), {"file": _upload(1)})
+    assert "already in progress" in r.context["error"]
+    assert ImportJob.objects.filter(user=user).count() == 1
+
+
+def test_failed_job_reports_error_and_rolls_back(user, monkeypatch):
+    import apps.reports.services as services_mod
+
+    monkeypatch.setattr(services_mod, "IMPORT_BATCH_SIZE", 2)
+    body = HEADER + ",ok,c,,,applied,,,\n" * 2 + f",{'x' * 300},c,,,applied,,,\n"
+    job = ImportJob.objects.create(
+        user=user,
+        source=ImportJobSource.UPLOAD,
+        file=SimpleUploadedFile("bad.csv", body.encode()),
+        filename="bad.csv",
+    )
+
+    run_import_job(claim_next_import_job())
+    job.refresh_from_db()
+
+    assert job.status == ImportJobStatus.FAILED
+    assert job.error
+    assert job.rows_done == 0
+    assert not JobApplication.objects.filter(user=user).exists()
+
+
+def test_stale_jobs_are_failed_by_last_progress_and_lose_their_file(user, media_root):
+    now = timezone.now()
+    dead = ImportJob.objects.create(
+        user=user, source=ImportJobSource.UPLOAD, file=_upload(2), filename="apps.csv"
+    )
+    alive = ImportJob.objects.create(
+        user=user, source=ImportJobSource.UPLOAD, file=_upload(2), filename="apps.csv"
+    )
+    long_ago = now - STALE_AFTER - timedelta(hours=1)
+    # Both claimed long ago; only `alive` reported a batch recently.
+    ImportJob.objects.filter(pk=dead.pk).update(
+        status=ImportJobStatus.RUNNING, started_at=long_ago, updated_at=long_ago, rows_done=2
+    )
+    ImportJob.objects.filter(pk=alive.pk).update(
+        status=ImportJobStatus.RUNNING, started_at=long_ago, updated_at=now - timedelta(minutes=1)
+    )
+    dead_path = media_root / dead.file.name
+
+    assert fail_stale_import_jobs(now) == 1
+
+    dead.refresh_from_db()
+    alive.refresh_from_db()
+    assert (dead.status, dead.rows_done, dead.finished_at) == (ImportJobStatus.FAILED, 0, now)
+    assert not dead.file
+    assert not dead_path.exists()
+    assert alive.status == ImportJobStatus.RUNNING
+    assert (media_root / alive.file.name).exists()
+
+
+def test_status_endpoint_is_user_scoped(client, user, django_user_model):
+    other = django_user_model.objects.create_user(username="u2", password="x")
+    job = ImportJob.objects.create(user=other, source=ImportJobSource.DRIVE, drive_file_id="f1")
+    client.force_login(user)
+    assert client.get(reverse("reports:import_job_status", args=[job.id])).status_code == 404
+
+
+def test_drive_restore_is_queued(client, user, monkeypatch):
+    app = SocialApp.objects.create(provider="google", name="google", client_id="cid", secret="sec")
+    acc = SocialAccount.objects.create(user=user, provider="google", uid="uid")
+    SocialToken.objects.create(account=acc, app=app, token="access", token_secret="refresh")
+    client.force_login(user)
+
+    r = client.get(
+        reverse("reports:drive_restore", args=["file-1"]), {"name": "autobackup_latest.csv"}
+    )
+    job = ImportJob.objects.get(user=user)
+    assert r.status_code == 302
+    assert (job.source, job.drive_file_id) == ("drive", "file-1")
+    assert job.filename == "autobackup_latest.csv"
+
+    seen_mid_download = []
+
+    def _chunks(user, file_id):
+        yield (HEADER + ",Restored,ACME,,,applied,,,\n").encode()
+        seen_mid_download.append(JobApplication.objects.filter(user=user).count())
+        yield b",Second,ACME,,,applied,,,\n"
+
+    monkeypatch.setattr("apps.reports.services.IMPORT_BATCH_SIZE", 1)
+    monkeypatch.setattr("apps.reports.jobs.iter_download", _chunks)
+    monkeypatch.setattr(
+        "apps.reports.jobs.backup_chain",
+        lambda user, file_id: [DriveFile(file_id, "autobackup_latest.csv", "text/csv")],
+    )
+    run_import_job(claim_next_import_job())
+    job.refresh_from_db()
+    assert job.status == ImportJobStatus.DONE
+    assert seen_mid_download == [1]  # first row applied before the download finished
+    titles = JobApplication.objects.filter(user=user).values_list("title", flat=True)
+    assert set(titles) == {"Restored", "Second"}
+
+
+def test_drive_restore_replays_full_snapshot_and_deltas(user, monkeypatch):
+    # Ids from another database: the delta must hit the rows the full snapshot created.
+    files = {
+        "full": HEADER + "101,Dev,ACME,,,applied,,,\n102,Ops,ACME,,,applied,,,\n",
+        "delta-1": (
+            HEADER.rstrip() + ",deleted\n101,Dev,ACME,,,offer,,,,\n103,QA,ACME,,,applied,,,,\n"
+        ),
+        "delta-2": HEADER.rstrip() + ",deleted\n102,,,,,,,,,1\n103,QA lead,ACME,,,applied,,,,\n",
+    }
+    monkeypatch.setattr(
+        "apps.reports.jobs.backup_chain",
+        lambda user, file_id: [DriveFile(n, n, "text/csv") for n in files],
+    )
+    monkeypatch.setattr(
+        "apps.reports.jobs.iter_download", lambda user, file_id: iter([files[file_id].encode()])
+    )
+    job = ImportJob.objects.create(user=user, source=ImportJobSource.DRIVE, drive_file_id="delta-2")
+
+    run_import_job(claim_next_import_job())
+    job.refresh_from_db()
+
+    assert job.status == ImportJobStatus.DONE, job.error
+    rows = JobApplication.objects.filter(user=user).values_list("title", "status")
+    assert sorted(rows) == [("Dev", "offer"), ("QA lead", "applied")]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_progress_is_visible_outside_the_import_transaction(django_user_model):
+    from django.db import transaction
+
+    from apps.reports.jobs import _ProgressReporter
+
+    u = django_user_model.objects.create_user(username="u3", password="x")
+    job = ImportJob.objects.create(user=u, source=ImportJobSource.DRIVE, drive_file_id="f1")
+    reporter = _ProgressReporter(job)
+    try:
+        with transaction.atomic():
+            reporter(3, 1)
+            transaction.set_rollback(True)
+        # committed on its own connection, so the rollback above doesn't undo it
+        assert ImportJob.objects.get(pk=job.pk).rows_done == 4
+    finally:
+        reporter.close()
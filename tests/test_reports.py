@@ -0,0 +1,272 @@
+import io
+from datetime import datetime, timedelta
+
+import pytest
+from django.db import DataError
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.accounts.models import UserProfile
+from apps.applications.models import JobApplication
+from apps.reports.services import build_stats, export_csv, import_csv, iter_csv, spool_export
+
+
+@pytest.fixture
+def user(db, django_user_model):
+    u = django_user_model.objects.create_user(username="u1", email="u1@example.com", password="x")
+    UserProfile.objects.create(user=u, google_data_access_consent=True)
+    return u
+
+
+def _at(y, m, d):
+    return timezone.make_aware(datetime(y, m, d, 10, 0))
+
+
+def test_build_stats_single_pass(user, django_assert_num_queries):
+    # Mon 2025-03-03 .. Tue 2025-04-01
+    rows = [
+        ("applied", _at(2025, 3, 3), None),
+        ("applied", _at(2025, 3, 4), None),
+        ("interview", _at(2025, 3, 12), _at(2025, 3, 14)),
+        ("rejected", _at(2025, 4, 1), _at(2025, 4, 5)),
+    ]
+    for status, applied, reply in rows:
+        JobApplication.objects.create(
+            user=user,
+            title="t",
+            company="c",
+            status=status,
+            applied_at=applied,
+            recruiter_reply_at=reply,
+        )
+
+    with django_assert_num_queries(2):
+        stats = build_stats(JobApplication.objects.filter(user=user))
+
+    assert stats.total == 4
+    assert stats.by_status == {"applied": 2, "interview": 1, "rejected": 1}
+    assert stats.replied == 2
+    assert stats.reply_rate == 0.5
+    assert stats.median_reply_time == timedelta(days=3)
+
+    assert [(p.start.isoformat(), p.count) for p in stats.per_month] == [
+        ("2025-03-01", 3),
+        ("2025-04-01", 1),
+    ]
+    assert [(p.start.isoformat(), p.count) for p in stats.per_week] == [
+        ("2025-03-03", 2),
+        ("2025-03-10", 1),
+        ("2025-03-31", 1),
+    ]
+
+
+def test_build_stats_empty_skips_median_query(user, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        stats = build_stats(JobApplication.objects.filter(user=user))
+    assert stats.total == 0
+    assert stats.by_status == {}
+    assert stats.reply_rate is None
+    assert stats.median_reply_time is None
+
+
+def test_statistics_page_renders(client, user):
+    JobApplication.objects.create(
+        user=user, title="t", company="c", recruiter_reply_at=timezone.now()
+    )
+    client.force_login(user)
+    r = client.get(reverse("reports:statistics"))
+    assert r.status_code == 200
+    assert b"Reply rate" in r.content
+
+
+def test_iter_csv_streams_in_chunks(user, monkeypatch):
+    import apps.reports.services as services_mod
+
+    JobApplication.objects.bulk_create(
+        JobApplication(user=user, title=f"Job {i}", company="ACME", notes="n" * 100)
+        for i in range(50)
+    )
+    monkeypatch.setattr(services_mod, "STREAM_BUFFER_SIZE", 1024)
+
+    qs = JobApplication.objects.filter(user=user).order_by("id")
+    chunks = list(iter_csv(qs, chunk_size=10))
+
+    assert len(chunks) > 1
+    body = b"".join(chunks)
+    assert body == export_csv(qs)
+    lines = body.decode("utf-8").splitlines()
+    assert lines[0] == "id,title,company,location,source,status,applied_at,recruiter_reply_at,notes"
+    assert len(lines) == 51
+
+
+def test_spool_export_rewinds_and_spills():
+    with spool_export([b"a" * 10, b"b" * 10], max_memory=8) as fh:
+        assert fh._rolled  # spilled to disk
+        assert fh.read() == b"a" * 10 + b"b" * 10
+
+
+def test_export_report_csv_is_streamed(client, user):
+    JobApplication.objects.create(user=user, title="Dev", company="ACME")
+    client.force_login(user)
+    r = client.get(reverse("reports:export", args=["csv"]))
+    assert r.status_code == 200
+    assert r.streaming
+    body = b"".join(r.streaming_content).decode("utf-8")
+    assert "Dev,ACME" in body
+
+
+def test_export_report_xlsx_write_only_typed_cells(client, user):
+    from openpyxl import load_workbook
+
+    applied = _at(2025, 3, 3)
+    JobApplication.objects.create(user=user, title="Dev", company="ACME", applied_at=applied)
+    client.force_login(user)
+
+    r = client.get(reverse("reports:export", args=["xlsx"]))
+    assert r.status_code == 200
+    assert 'filename="jobapply_export.xlsx"' in r["Content-Disposition"]
+
+    wb = load_workbook(io.BytesIO(b"".join(r.streaming_content)))
+    ws = wb["applications"]
+    header, row = list(ws.iter_rows(values_only=True))
+    assert header[:3] == ("id", "title", "company")
+    assert row[1:3] == ("Dev", "ACME")
+    assert row[6] == timezone.localtime(applied).replace(tzinfo=None)
+    assert row[7] is None
+
+
+def _csv(rows) -> bytes:
+    header = "id,title,company,location,source,status,applied_at,recruiter_reply_at,notes\n"
+    return (header + "".join(",".join(r) + "\n" for r in rows)).encode("utf-8")
+
+
+def test_import_csv_bulk_upserts_in_batches(
+    user, django_user_model, monkeypatch, django_assert_max_num_queries
+):
+    import apps.reports.services as services_mod
+
+    monkeypatch.setattr(services_mod, "IMPORT_BATCH_SIZE", 100)
+    mine = JobApplication.objects.create(user=user, title="Old", company="Old Co")
+    other = django_user_model.objects.create_user(username="u2", password="x")
+    foreign = JobApplication.objects.create(user=other, title="Theirs", company="X")
+
+    rows = [[str(mine.id), "New", "New Co", "", "", "offer", "2025-03-03", "", "note"]]
+    rows.append([str(foreign.id), "Stolen?", "X", "", "", "applied", "", "", ""])
+    rows += [["", f"Job {i}", "ACME", "", "", "applied", "2025-03-03", "", ""] for i in range(298)]
+
+    # 3 batches x (id lookup + insert + update) + savepoint bookkeeping, not 2 per row
+    with django_assert_max_num_queries(12):
+        result = import_csv(user, _csv(rows))
+
+    assert result["created"] == 299
+    assert result["updated"] == 1
+    assert result["seconds"] >= 0
+
+    mine.refresh_from_db()
+    assert (mine.title, mine.status, mine.notes) == ("New", "offer", "note")
+    assert mine.updated_at > mine.created_at
+    foreign.refresh_from_db()
+    assert foreign.title == "Theirs"
+    assert JobApplication.objects.filter(user=user).count() == 300
+
+
+def test_import_csv_is_atomic(user, monkeypatch):
+    import apps.reports.services as services_mod
+
+    monkeypatch.setattr(services_mod, "IMPORT_BATCH_SIZE", 2)
+    rows = [["", "ok", "c", "", "", "applied", "", "", ""]] * 3
+    rows.append(["", "x" * 300, "c", "", "", "applied", "", "", ""])  # title > max_length
+
+    with pytest.raises(DataError):
+        import_csv(user, _csv(rows))
+    assert JobApplication.objects.filter(user=user).count() == 0
+
+
+def test_import_csv_parses_chunk_stream(user):
+    body = _csv(
+        [
+            ["", "Dev", "ACME", "", "", "applied", "", "", '"multi\nline, ünïcode"'],
+            ["", "Ops", "ACME", "", "", "applied", "", "", ""],
+        ]
+    )
+    # 1-byte chunks split multi-byte characters and quoted newlines
+    result = import_csv(user, (body[i : i + 1] for i in range(len(body))))
+
+    assert result["created"] == 2
+    dev = JobApplication.objects.get(user=user, title="Dev")
+    assert dev.notes == "multi\nline, ünïcode"
+
+
+def test_import_csv_enforces_limits(user):
+    from apps.reports.services import ImportLimitError
+
+    body = _csv([["", f"Job {i}", "ACME", "", "", "applied", "", "", ""] for i in range(5)])
+
+    with pytest.raises(ImportLimitError):
+        import_csv(user, io.BytesIO(body), max_rows=4)
+    with pytest.raises(ImportLimitError):
+        import_csv(user, io.BytesIO(body), max_bytes=len(body) - 1)
+    assert not JobApplication.objects.filter(user=user).exists()
+
+    assert import_csv(user, io.BytesIO(body), max_rows=5)["created"] == 5
+
+
+def test_import_view_rejects_oversized_upload(client, user, settings):
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    settings.IMPORT_MAX_BYTES = 10
+    client.force_login(user)
+    body = _csv([["", "Dev", "ACME", "", "", "", "", "", ""]])
+    upload = SimpleUploadedFile("a.csv", body, "text/csv")
+    r = client.post(reverse("reports:import"), {"file": upload})
+    assert "too large" in r.context["error"]
+
+
+def test_gzip_export_round_trips_through_import(user, django_user_model):
+    import gzip
+
+    from apps.reports.services import count_csv_rows, gzip_chunks
+
+    JobApplication.objects.bulk_create(
+        JobApplication(user=user, title=f"Job {i}", company="ACME", notes="Lorem ipsum " * 20)
+        for i in range(200)
+    )
+    qs = JobApplication.objects.filter(user=user).order_by("id")
+    plain = export_csv(qs)
+    packed = b"".join(gzip_chunks(iter_csv(qs)))
+
+    assert gzip.decompress(packed) == plain
+    assert len(packed) < len(plain) / 5
+
+    # Same rows without ids into another account, fed in 7-byte chunks.
+    other = django_user_model.objects.create_user(username="u2", password="x")
+    rows = [["", line.split(",", 1)[1]] for line in plain.decode().splitlines()[1:]]
+    packed_new = gzip.compress(_csv(rows))
+    assert count_csv_rows(io.BytesIO(packed_new)) == 200
+    result = import_csv(other, (packed_new[i : i + 7] for i in range(0, len(packed_new), 7)))
+    assert result["created"] == 200
+
+
+def test_gzip_import_limit_applies_to_decompressed_size(user):
+    import gzip
+
+    from apps.reports.services import ImportLimitError
+
+    bomb = gzip.compress(_csv([["", "x", "y", "", "", "applied", "", "", "n" * 100_000]]))
+    with pytest.raises(ImportLimitError):
+        import_csv(user, bomb, max_bytes=50_000)
+
+
+def test_truncated_gzip_import_writes_nothing(user):
+    import gzip
+
+    from apps.reports.services import IMPORT_BATCH_SIZE, ImportFormatError
+
+    rows = [
+        ["", f"Job {i}", "ACME", "", "", "applied", "", "", ""]
+        for i in range(IMPORT_BATCH_SIZE * 4)
+    ]
+    packed = gzip.compress(_csv(rows))
+    with pytest.raises(ImportFormatError):
+        import_csv(user, packed[: len(packed) // 2])
+    assert not JobApplication.objects.filter(user=user).exists()